@@ -0,0 +1,412 @@
+"""
+@description: This file contains the benchmark suite. It times the shortest path algorithms on generated graphs without any window, and compares the results with a saved baseline.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+import numpy as np
+
+# Import modules
+from contraction import ContractionHierarchy
+from generators import FAMILIES, build_graph
+
+ALGORITHMS = {
+    "dijkstra": ("dijkstra", {}),
+    "dijkstra-lazy": ("dijkstra", {"lazy": True}),
+    "dijkstra-4-ary": ("dijkstra", {"queue": "4-ary"}),
+    "dijkstra-pairing": ("dijkstra", {"queue": "pairing"}),
+    "dijkstra-radix": ("dijkstra", {"queue": "radix"}),
+    "dijkstra-dial": ("dijkstra", {"queue": "dial"}),
+    "dijkstra-lazy-4-ary": ("dijkstra", {"lazy": True, "queue": "4-ary"}),
+    "dijkstra-lazy-pairing": ("dijkstra", {"lazy": True, "queue": "pairing"}),
+    "dijkstra-lazy-radix": ("dijkstra", {"lazy": True, "queue": "radix"}),
+    "dijkstra-lazy-dial": ("dijkstra", {"lazy": True, "queue": "dial"}),
+    "a_star": ("a_star", {}),
+    "a_star-manhattan": ("a_star", {"heuristic": "manhattan"}),
+    "a_star-euclidean": ("a_star", {"heuristic": "euclidean"}),
+    "a_star-landmarks": ("a_star", {"heuristic": "landmarks"}),
+    "bidirectional_dijkstra": ("bidirectional_dijkstra", {}),
+    "bidirectional_a_star-manhattan": (
+        "bidirectional_a_star",
+        {"heuristic": "manhattan"},
+    ),
+    "bidirectional_a_star-landmarks": (
+        "bidirectional_a_star",
+        {"heuristic": "landmarks"},
+    ),
+    "ch": ("query", {}),
+}  # Benchmarked algorithms by label: (method, options)
+
+FIELDS = [
+    "family",
+    "nodes",
+    "edges",
+    "algorithm",
+    "pairs",
+    "trials",
+    "median_ms",
+    "p90_ms",
+    "p99_ms",
+    "mean_ms",
+    "min_ms",
+    "max_ms",
+    "repetition",
+    "distance_sum",
+    "build_s",
+    "preprocess_s",
+]  # Columns of the results
+
+
+def _prepare(g, algorithm: str):
+    """
+    This function runs the preprocessing an algorithm needs and returns its search function.
+
+    Args:
+        g (Graph): Graph object
+        algorithm (str): Label of the algorithm, one of ALGORITHMS
+
+    Returns:
+        search (function): Function (source, target) -> metrics
+        preprocess (float): Time of the preprocessing in seconds
+    """
+    method, options = ALGORITHMS[algorithm]
+    start = time.perf_counter()
+    if algorithm == "ch":  # The hierarchy answers the queries
+        owner = ContractionHierarchy.build(g)
+    else:
+        owner = g
+        if options.get("heuristic") == "landmarks" and g.landmarks is None:
+            g.preprocess_landmarks()
+    preprocess = time.perf_counter() - start
+    search = getattr(owner, method)
+    return (lambda source, target: search(source, target, **options)), preprocess
+
+
+def run_benchmark(
+    families,
+    sizes,
+    algorithms,
+    pairs: int = 10,
+    warmup: int = 1,
+    trials: int = 5,
+    seed: int = 0,
+    frozen: bool = False,
+    log=None,
+):
+    """
+    This function times the algorithms on every family and size. The same random
+    (source, target) pairs are used for all algorithms of a graph. Every pair is run
+    warmup times without timing, then trials times with timing, and every timed run is
+    one sample of the percentiles.
+
+    Args:
+        families (list): Graph families, see generators.FAMILIES
+        sizes (list): Numbers of nodes
+        algorithms (list): Labels of the algorithms, see ALGORITHMS
+        pairs (int): Number of (source, target) pairs per graph
+        warmup (int): Untimed runs per pair
+        trials (int): Timed runs per pair
+        seed (int): Seed of the graphs and of the pairs
+        frozen (bool): Whether to benchmark CSRGraph instead of Graph
+        log (file): Where to print the progress, None for no output
+
+    Returns:
+        records (list): One dictionary per (family, size, algorithm), with the FIELDS keys
+    """
+    for algorithm in algorithms:  # Check the labels before any work
+        if algorithm not in ALGORITHMS:
+            raise ValueError(
+                f"Unknown algorithm {algorithm!r}, expected one of {sorted(ALGORITHMS)}"
+            )
+    records = []
+    for family in families:
+        for N in sizes:
+            start = time.perf_counter()
+            g = build_graph(family, N, frozen=frozen)  # The graph of the experiment
+            build = time.perf_counter() - start
+            edges = sum(1 for _ in g.iter_edges())  # Number of undirected edges
+            nodes = sorted(g.graph.keys())
+            rng = random.Random(seed)  # Same pairs for every algorithm
+            queries = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(pairs)]
+            for algorithm in algorithms:
+                search, preprocess = _prepare(g, algorithm)
+                for _ in range(warmup):  # Untimed runs
+                    for source, target in queries:
+                        search(source, target)
+                samples, repetitions = [], []
+                for _ in range(trials):  # Timed runs
+                    for source, target in queries:
+                        start = time.perf_counter()
+                        metrics = search(source, target)
+                        samples.append(time.perf_counter() - start)
+                        repetitions.append(metrics["repetition"])
+                distance_sum = sum(
+                    search(source, target)["distance"] for source, target in queries
+                )  # Checksum of the answers, compared with the baseline
+                samples = np.array(samples) * 1000  # Milliseconds
+                records.append(
+                    {
+                        "family": family,
+                        "nodes": N,
+                        "edges": edges,
+                        "algorithm": algorithm,
+                        "pairs": pairs,
+                        "trials": trials,
+                        "median_ms": float(np.median(samples)),
+                        "p90_ms": float(np.percentile(samples, 90)),
+                        "p99_ms": float(np.percentile(samples, 99)),
+                        "mean_ms": float(samples.mean()),
+                        "min_ms": float(samples.min()),
+                        "max_ms": float(samples.max()),
+                        "repetition": float(np.median(repetitions)),
+                        "distance_sum": distance_sum,
+                        "build_s": build,
+                        "preprocess_s": preprocess,
+                    }
+                )
+                if log is not None:
+                    print(format_record(records[-1]), file=log, flush=True)
+    return records
+
+
+def format_record(record) -> str:
+    """
+    This function formats one result as a line of text.
+
+    Args:
+        record (dict): Result of run_benchmark
+
+    Returns:
+        line (str): The formatted result
+    """
+    return (
+        f"{record['family']:>8} {record['nodes']:>9} {record['algorithm']:<32}"
+        f" median {record['median_ms']:10.3f} ms  p90 {record['p90_ms']:10.3f} ms"
+        f"  p99 {record['p99_ms']:10.3f} ms  repetition {record['repetition']:>10.0f}"
+    )
+
+
+def write_json(records, path: str):
+    """
+    This function writes the results to a JSON file.
+
+    Args:
+        records (list): Results of run_benchmark
+        path (str): Path of the file
+
+    Returns:
+        None
+    """
+    with open(path, "w") as file:
+        json.dump(records, file, indent=2)
+
+
+def write_csv(records, path: str):
+    """
+    This function writes the results to a CSV file with the FIELDS columns.
+
+    Args:
+        records (list): Results of run_benchmark
+        path (str): Path of the file
+
+    Returns:
+        None
+    """
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def load_results(path: str):
+    """
+    This function reads results written by write_json or write_csv.
+
+    Args:
+        path (str): Path of a .json or .csv file
+
+    Returns:
+        records (list): The results
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="") as file:
+            records = list(csv.DictReader(file))
+        for record in records:  # CSV stores everything as text
+            for field in FIELDS:
+                if field not in ("family", "algorithm"):
+                    record[field] = float(record[field])
+        return records
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(records, baseline, threshold: float = 0.1):
+    """
+    This function compares the median times with a baseline. A result is a regression
+    when it is slower than the baseline by more than the threshold, and a mismatch when
+    its distances differ from the baseline.
+
+    Args:
+        records (list): Results of run_benchmark
+        baseline (list): Results of an earlier run
+        threshold (float): Allowed relative difference of the median times
+
+    Returns:
+        rows (list): (family, nodes, algorithm, baseline median, median, ratio, status)
+    """
+    previous = {
+        (record["family"], int(record["nodes"]), record["algorithm"]): record
+        for record in baseline
+    }  # Baseline results by experiment
+    rows = []
+    for record in records:
+        old = previous.get(
+            (record["family"], int(record["nodes"]), record["algorithm"])
+        )
+        if old is None:  # Not in the baseline
+            continue
+        ratio = record["median_ms"] / old["median_ms"] if old["median_ms"] else 1.0
+        if record["distance_sum"] != old["distance_sum"]:
+            status = "mismatch"
+        elif ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append(
+            (
+                record["family"],
+                record["nodes"],
+                record["algorithm"],
+                old["median_ms"],
+                record["median_ms"],
+                ratio,
+                status,
+            )
+        )
+    return rows
+
+
+def plot_results(records, path: str):
+    """
+    This function saves a plot of the median times against the number of nodes. It uses
+    the Agg backend, so no window is opened.
+
+    Args:
+        records (list): Results of run_benchmark
+        path (str): Path of the image
+
+    Returns:
+        None
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")  # Draw to a file only
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8, 5))
+    for family, algorithm in sorted(
+        {(record["family"], record["algorithm"]) for record in records}
+    ):  # One line per family and algorithm
+        points = sorted(
+            (record["nodes"], record["median_ms"])
+            for record in records
+            if record["family"] == family and record["algorithm"] == algorithm
+        )
+        plt.plot(*zip(*points), marker="o", label=f"{family} {algorithm}")
+    plt.xlabel("Input size (number of nodes in the Graph)")
+    plt.ylabel("Median running time (ms)")
+    plt.yscale("log")
+    plt.legend(fontsize="small")
+    plt.savefig(path, bbox_inches="tight")
+    plt.close()
+
+
+def main(argv=None) -> int:
+    """
+    This function runs the benchmark from the command line.
+
+    Args:
+        argv (list): Arguments, sys.argv[1:] by default
+
+    Returns:
+        status (int): 1 if --fail-on-regression is given and a result regressed, else 0
+    """
+    parser = argparse.ArgumentParser(description="Shortest path benchmark")
+    parser.add_argument(
+        "--families", nargs="+", default=["banded"], choices=sorted(FAMILIES)
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[10, 50, 100, 200, 500, 1000, 2000]
+    )
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        default=["dijkstra", "a_star"],
+        choices=sorted(ALGORITHMS),
+    )
+    parser.add_argument("--pairs", type=int, default=10, help="queries per graph")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per query")
+    parser.add_argument("--trials", type=int, default=5, help="timed runs per query")
+    parser.add_argument("--seed", type=int, default=0, help="seed of graphs and pairs")
+    parser.add_argument("--frozen", action="store_true", help="benchmark CSRGraph")
+    parser.add_argument("--json", help="write the results to a JSON file")
+    parser.add_argument("--csv", help="write the results to a CSV file")
+    parser.add_argument("--plot", help="save a plot of the results to an image")
+    parser.add_argument("--baseline", help="JSON or CSV results to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="allowed relative slowdown"
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="exit with status 1 on a regression or mismatch",
+    )
+    args = parser.parse_args(argv)
+
+    records = run_benchmark(
+        args.families,
+        args.sizes,
+        args.algorithms,
+        pairs=args.pairs,
+        warmup=args.warmup,
+        trials=args.trials,
+        seed=args.seed,
+        frozen=args.frozen,
+        log=sys.stdout,
+    )
+    if args.json:
+        write_json(records, args.json)
+    if args.csv:
+        write_csv(records, args.csv)
+    if args.plot:
+        plot_results(records, args.plot)
+
+    status = 0
+    if args.baseline:
+        print(f"Comparison with {args.baseline}:")
+        for family, nodes, algorithm, old, new, ratio, result in compare_results(
+            records, load_results(args.baseline), args.threshold
+        ):
+            print(
+                f"{family:>8} {nodes:>9.0f} {algorithm:<32} {old:10.3f} ms -> "
+                f"{new:10.3f} ms  x{ratio:5.2f}  {result}"
+            )
+            if result in ("regression", "mismatch") and args.fail_on_regression:
+                status = 1
+    return status
+
+
+""" python benchmark.py --families banded grid --sizes 1000 10000 --json results.json """
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+@description: This file contains the LRUCache class. It stores the results of recent shortest path queries.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import threading
+from collections import OrderedDict
+
+MISSING = object()  # Returned by get when the key is not in the cache
+
+
+class LRUCache:
+    """
+    This class is a bounded cache that evicts the least recently used entry when it is
+    full. The entries are kept in an ordered dictionary, from the least to the most
+    recently used, so every operation takes O(1) time.
+    The cache remembers the version of the graph its entries were computed on, and it
+    empties itself when it is used with another version. A lock makes every operation
+    safe to call from several threads.
+
+    @attributes:
+        maxsize (int): Largest number of entries.
+        entries (OrderedDict): The cached values, from the least to the most recently used.
+        version (int): Version of the graph the entries belong to.
+        hits (int): Number of lookups that found their key.
+        misses (int): Number of lookups that did not find their key.
+        evictions (int): Number of entries removed to make room for new ones.
+        invalidations (int): Number of times the cache was emptied because the graph changed.
+        lock (Lock): Lock of the entries and the statistics.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:  # Check the size
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    def _validate(self, version: int):
+        """
+        This function empties the cache if its entries belong to another version of the
+        graph. The lock must be held.
+
+        Args:
+            version (int): Current version of the graph
+
+        Returns:
+            None
+        """
+        if version != self.version:  # The graph has changed
+            if self.entries:  # Count only the invalidations that drop entries
+                self.invalidations += 1
+            self.entries.clear()  # Forget the old results
+            self.version = version
+
+    def get(self, key, version: int):
+        """
+        This function looks a key up and marks it as the most recently used.
+
+        Args:
+            key (tuple): Key of the query
+            version (int): Current version of the graph
+
+        Returns:
+            value: The cached value, or MISSING if the key is not in the cache
+        """
+        with self.lock:
+            self._validate(version)  # Drop the results of old versions
+            value = self.entries.get(key, MISSING)  # Look the key up
+            if value is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)  # Most recently used
+            return value
+
+    def put(self, key, value, version: int):
+        """
+        This function stores a value and evicts the least recently used entry if needed.
+
+        Args:
+            key (tuple): Key of the query
+            value: Value to be stored
+            version (int): Version of the graph the value was computed on
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if version < self.version:  # The graph changed during the search
+                return
+            self._validate(version)
+            self.entries[key] = value  # Store the value
+            self.entries.move_to_end(key)  # Most recently used
+            if len(self.entries) > self.maxsize:  # The cache is full
+                self.entries.popitem(last=False)  # Evict the least recently used entry
+                self.evictions += 1
+
+    def clear(self):
+        """
+        This function removes all entries. The statistics are kept.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        """
+        This function returns the statistics of the cache.
+
+        Returns:
+            stats (dict): size, maxsize, hits, misses, evictions, invalidations and the hit rate
+        """
+        with self.lock:
+            lookups = self.hits + self.misses  # Number of lookups
+            return {
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self.entries)  # Number of entries
+
+    def __contains__(self, key):
+        return key in self.entries  # Does not count as a lookup
@@ -0,0 +1,317 @@
+"""
+@description: This file contains the ContractionHierarchy class. It preprocesses a graph once and then answers shortest path queries with a small bidirectional search.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import modules
+from min_heap import MinHeap
+
+
+def _witness_search(adjacency, source, excluded, targets, max_distance, max_settled):
+    """
+    This function runs a limited dijkstra search from the source that does not pass
+    through the excluded node. Every distance it returns is the length of a real path,
+    so it is a witness that a shortcut through the excluded node is not needed.
+
+    Args:
+        adjacency (dict): Remaining graph, node -> {neighbor: weight}
+        source (int): Source node
+        excluded (int): Node that is being contracted
+        targets (set): The search stops when these nodes are settled
+        max_distance (int): Paths longer than this distance are not followed
+        max_settled (int): The search stops after settling this many nodes
+
+    Returns:
+        distances (dict): Lengths of the paths found from the source
+    """
+    distances = {source: 0}  # Initialize the distance mapping
+    heap = MinHeap()  # Initialize the heap
+    heap.push((0, source))  # (distance, node)
+    remaining = set(targets)  # Targets that are not settled yet
+    settled = 0  # Number of settled nodes
+    while heap.heap and remaining and settled < max_settled:  # Until it is done
+        distance, node = heap.pop()  # Pop the node with the smallest distance
+        settled += 1  # Settle the node
+        remaining.discard(node)  # It may be one of the targets
+        for neighbor, weight in adjacency[node].items():  # Relax the edges
+            if neighbor == excluded:  # Do not pass through the contracted node
+                continue
+            new_distance = distance + weight  # Calculate the new distance
+            if new_distance > max_distance:  # Too long to be a witness
+                continue
+            if new_distance < distances.get(neighbor, float("inf")):
+                distances[neighbor] = new_distance  # Update the distance
+                if heap.contains(neighbor):  # If the neighbor is in the heap
+                    heap.decrease_key(neighbor, new_distance)  # decrease its key
+                else:  # If it is reached for the first time
+                    heap.push((new_distance, neighbor))  # push it to the heap
+    return distances
+
+
+class ContractionHierarchy:
+    """
+    This class implements Contraction Hierarchies. The nodes are contracted one by one
+    in order of importance. When a node is contracted, shortcut edges are added between
+    its neighbors wherever it lay on the only shortest path between them. A query then
+    only has to search upwards, towards more important nodes, from both ends.
+    Graphs without a hierarchy, such as random graphs, become dense while they are being
+    contracted, so the contraction stops at a core when the least important node has too
+    many neighbors: the remaining nodes keep all their edges, share the highest rank, and
+    queries cross the core with a bidirectional dijkstra search.
+
+    @attributes:
+        rank (dict): A dictionary mapping nodes to their contraction order.
+        top (int): Rank of the core nodes, the highest rank.
+        upward (dict): A dictionary mapping nodes to the (neighbor, weight) pairs of their
+            edges and shortcuts to more important nodes.
+        middle (dict): A dictionary mapping the (node1, node2) pairs of shortcuts to the
+            contracted node they skip, used to unpack paths.
+    """
+
+    def __init__(self, rank, upward, middle):
+        self.rank = rank
+        self.upward = upward
+        self.middle = middle
+        self.top = max(rank.values(), default=0)
+
+    @classmethod
+    def build(
+        cls, g, max_settled: int = 32, max_degree: int = 8
+    ) -> "ContractionHierarchy":
+        """
+        This function contracts the graph. The order is chosen with the edge difference
+        (shortcuts added minus edges removed) plus the number of contracted neighbors.
+        Priorities are updated lazily: only the priority of the node at the top of the
+        heap is computed again, and the node is pushed back if it is no longer the least
+        important one. The contraction stops at the first node with more than max_degree
+        neighbors, so every priority costs at most max_degree witness searches of
+        max_settled nodes, and the build time grows linearly with the number of nodes.
+
+        Args:
+            g (Graph): Graph object
+            max_settled (int): Size limit of the witness searches. Smaller limits build
+                faster but add more shortcuts.
+            max_degree (int): The contraction stops when the least important node has
+                more neighbors than this value. Larger values contract more nodes, which
+                makes the core smaller and the queries faster, but the build slower.
+
+        Returns:
+            hierarchy (ContractionHierarchy): Contracted graph
+        """
+        adjacency = {node: {} for node in g.graph.keys()}  # Remaining graph
+        for node in g.graph.keys():  # Keep the lightest of parallel edges
+            for neighbor, weight in g.graph[node]:
+                if neighbor != node and weight < adjacency[node].get(
+                    neighbor, float("inf")
+                ):
+                    adjacency[node][neighbor] = weight
+        deleted = dict.fromkeys(adjacency, 0)  # Number of contracted neighbors
+
+        def shortcuts(v):
+            """Returns the shortcuts needed to contract v, as (u, w, length) triples."""
+            neighbors = list(adjacency[v].items())  # Remaining neighbors of v
+            needed = []  # Shortcuts
+            for i, (u, to_u) in enumerate(neighbors):  # Every pair once
+                lengths = {w: to_u + to_w for w, to_w in neighbors[i + 1 :]}
+                if not lengths:  # No pairs left
+                    continue
+                witnesses = _witness_search(
+                    adjacency, u, v, lengths, max(lengths.values()), max_settled
+                )  # Paths between the neighbors that avoid v
+                for w, length in lengths.items():  # Keep the pairs without witness
+                    if witnesses.get(w, float("inf")) > length:
+                        needed.append((u, w, length))
+            return needed
+
+        def priority(v):
+            """Returns the priority of v and the shortcuts needed to contract it, None if
+            v has more than max_degree neighbors."""
+            degree = len(adjacency[v])
+            if degree > max_degree:  # No witness search, assume every pair is needed
+                return degree * (degree - 1) // 2 - degree + deleted[v], None
+            needed = shortcuts(v)
+            return len(needed) - degree + deleted[v], needed
+
+        heap = MinHeap()  # Nodes by priority
+        for node in adjacency:
+            heap.push((priority(node)[0], node))
+
+        rank, upward, middle = {}, {}, {}
+        while heap.heap:  # Contract the nodes
+            _, v = heap.pop()  # The least important node
+            value, needed = priority(v)  # Its priority may have changed
+            if heap.heap and value > heap.heap[0][0]:  # Not the least important anymore
+                heap.push((value, v))
+                continue
+            if needed is None:  # Too many neighbors, the rest is the core
+                break
+            rank[v] = len(rank)  # Contraction order
+            upward[v] = list(adjacency[v].items())  # Remaining neighbors are higher
+            for u, w, length in needed:  # Add the shortcuts
+                if length < adjacency[u].get(w, float("inf")):
+                    adjacency[u][w] = adjacency[w][u] = length
+                    middle[(u, w)] = middle[(w, u)] = v
+            for u in adjacency[v]:  # Remove v from the remaining graph
+                del adjacency[u][v]
+                deleted[u] += 1
+            del adjacency[v]
+
+        top = len(rank)  # The core nodes share the highest rank
+        for v in adjacency:
+            rank[v] = top
+            upward[v] = list(adjacency[v].items())  # and keep all their edges
+        return cls(rank, upward, middle)
+
+    def shortcut_count(self) -> int:
+        """
+        This function returns the number of shortcut edges added by the contraction.
+
+        Returns:
+            count (int): Number of shortcuts
+        """
+        return len(self.middle) // 2  # Shortcuts are stored in both directions
+
+    def _relax(self, heap: MinHeap, distances, parents, node: int) -> int:
+        """
+        This function relaxes the upward edges of a node in one direction of a query.
+
+        Args:
+            heap (MinHeap): Heap of the direction
+            distances (dict): Distances of the direction
+            parents (dict): Parents of the direction
+            node (int): Node whose edges are relaxed
+
+        Returns:
+            repetition (int): Number of distances that were improved
+        """
+        repetition = 0
+        distance = distances[node]
+        for neighbor, weight in self.upward[node]:
+            new_distance = distance + weight
+            if new_distance < distances.get(neighbor, float("inf")):
+                repetition += 1
+                distances[neighbor] = new_distance  # Update the distance
+                parents[neighbor] = node  # Update the parent
+                if heap.contains(neighbor):
+                    heap.decrease_key(neighbor, new_distance)
+                else:
+                    heap.push((new_distance, neighbor))
+        return repetition
+
+    def query(self, source: int, target: int, viz: bool = False):
+        """
+        This function finds the shortest path in two phases. First, a dijkstra search on
+        the upward edges is run from both ends, without expanding the core nodes; each
+        direction stops when its smallest key reaches the length of the best path found so
+        far. Then the core is crossed with a bidirectional dijkstra search that starts from
+        the core nodes reached by both directions, and stops when the smallest keys of the
+        two heaps add up to the length of the best path. The shortcuts of the path are
+        unpacked at the end.
+
+        Args:
+            source (int): id of the source node
+            target (int): id of the target node
+            viz (bool): whether to visualize the search
+
+        Returns:
+            metrics (dict): dictionary containing the number of visited nodes, the number of
+                repetitions, the path and the distance of the shortest path from the source
+                to the target node in the graph
+        """
+        metrics = {
+            "visited": 0,
+            "repetition": 0,
+            "path": [],
+            "distance": 0,
+        }  # Initialize the metrics
+        rank, top = self.rank, self.top
+        distances = ({source: 0}, {target: 0})  # Forward and backward distances
+        parents = ({source: source}, {target: target})  # Forward and backward parents
+        heaps = (MinHeap(), MinHeap())  # Forward and backward heaps
+        heaps[0].push((0, source))
+        heaps[1].push((0, target))
+
+        best = 0 if source == target else float("inf")  # Length of the best path
+        meeting = source if source == target else None  # Highest node of the path
+        repetition = 0  # Number of repetitions
+        while True:  # Upward searches
+            open_sides = [
+                side
+                for side in (0, 1)
+                if heaps[side].heap and heaps[side].heap[0][0] < best
+            ]  # Directions that can still improve the best path
+            if not open_sides:
+                break
+            side = min(open_sides, key=lambda side: heaps[side].heap[0][0])
+            distance, node = heaps[side].pop()  # Pop the node with the smallest key
+            other = distances[1 - side].get(node)  # Distance from the other end
+            if other is not None and distance + other < best:  # The searches meet
+                best, meeting = distance + other, node
+            if rank[node] != top:  # The core is searched in the second phase
+                repetition += self._relax(
+                    heaps[side], distances[side], parents[side], node
+                )
+
+        heaps = (MinHeap(), MinHeap())  # Core search from the reached core nodes
+        for side in (0, 1):
+            for node, distance in distances[side].items():
+                if rank[node] == top and distance < best:
+                    heaps[side].push((distance, node))
+        while heaps[0].heap and heaps[1].heap:
+            if heaps[0].heap[0][0] + heaps[1].heap[0][0] >= best:  # No better path
+                break
+            side = 0 if len(heaps[0].heap) <= len(heaps[1].heap) else 1
+            _, node = heaps[side].pop()  # Expand the smaller frontier
+            repetition += self._relax(heaps[side], distances[side], parents[side], node)
+            for neighbor, _ in self.upward[node]:  # The searches may meet at a neighbor
+                other = distances[1 - side].get(neighbor)
+                if other is not None and distances[side][neighbor] + other < best:
+                    best, meeting = distances[side][neighbor] + other, neighbor
+
+        if meeting is None:  # The searches did not meet
+            return metrics
+
+        path = [meeting]  # Path from the source to the meeting node
+        while path[-1] != source:
+            path.append(parents[0][path[-1]])
+        path.reverse()
+        while path[-1] != target:  # Path from the meeting node to the target
+            path.append(parents[1][path[-1]])
+        path = self._unpack(path)  # Replace the shortcuts by the original edges
+
+        predecessor = {source: None if viz else source}  # Parents along the path
+        for previous, node in zip(path, path[1:]):
+            predecessor[node] = previous
+
+        metrics["visited"] = len(path)  # Set the number of visited nodes
+        metrics["repetition"] = repetition  # Set the number of repetitions
+        metrics["path"] = path  # Set the path
+        metrics["distance"] = best  # Set the distance
+        metrics["predecessor"] = predecessor  # Set the predecessor mapping
+        return metrics
+
+    def _unpack(self, path):
+        """
+        This function replaces every shortcut of the path by the edges it skips.
+
+        Args:
+            path (list): Path that may contain shortcuts
+
+        Returns:
+            path (list): Path made of original edges
+        """
+        unpacked = [path[0]]  # Unpacked path
+        for node1, node2 in zip(path, path[1:]):  # Iterate over the edges
+            stack = [(node1, node2)]  # Edges left to unpack, in reverse order
+            while stack:
+                u, w = stack.pop()
+                v = self.middle.get((u, w))  # Node skipped by the shortcut
+                if v is None:  # Original edge
+                    unpacked.append(w)
+                else:  # Shortcut u - v - w
+                    stack.append((v, w))
+                    stack.append((u, v))
+        return unpacked
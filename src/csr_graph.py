@@ -0,0 +1,447 @@
+"""
+@description: This file contains the CSRGraph class. It is a frozen, array-backed version of the Graph class.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+import numpy as np
+
+# Import modules
+from graph import Graph
+
+
+def _typecode(values) -> str:
+    """Returns the array typecode that can store all the given values exactly.
+
+    Args:
+        values (list): list of numbers
+
+    Returns:
+        typecode (str): "q" if all the values are integers, "d" otherwise
+    """
+    for value in values:  # Iterate over the values
+        if not isinstance(value, int):  # If one of them is not an integer,
+            return "d"  # store all of them as doubles.
+    return "q"  # Store all of them as 64-bit integers.
+
+
+def _to_array(values: np.ndarray) -> array:
+    """Copies a NumPy array into an array buffer with the matching typecode.
+
+    Args:
+        values (np.ndarray): array of numbers
+
+    Returns:
+        buffer (array): array of 64-bit integers, or of doubles for non-integer values
+    """
+    if np.issubdtype(values.dtype, np.integer):  # If the values are integers,
+        buffer, values = array("q"), values.astype(np.int64)  # store 64-bit integers.
+    else:  # Otherwise,
+        buffer, values = array("d"), values.astype(np.float64)  # store doubles.
+    buffer.frombytes(values.tobytes())  # Copy the raw bytes
+    return buffer
+
+
+def first_id(node_ids):
+    """
+    This function returns the first node id if the node ids are first, first + 1, ...
+
+    Args:
+        node_ids (array): Node ids of the rows
+
+    Returns:
+        first (int): Id of the first node, or None if the ids are not contiguous
+    """
+    if len(node_ids) == 0:  # No rows
+        return None
+    ids = np.frombuffer(node_ids, dtype=np.int64)  # No copy
+    if ids[-1] - ids[0] != len(ids) - 1 or np.any(np.diff(ids) != 1):
+        return None
+    return int(ids[0])
+
+
+class _RangeIndex(Mapping):
+    """
+    This class maps the node ids first, first + 1, ... to the rows 0, 1, ... without
+    storing them. It can replace the index dictionary when the node ids are contiguous,
+    so a CSRGraph of a memory-mapped file opens without reading its node ids.
+    """
+
+    def __init__(self, first: int, length: int):
+        self.first = first  # Node id of the first row
+        self.length = length  # Number of rows
+
+    def __getitem__(self, node):
+        if isinstance(node, (int, np.integer)) and 0 <= node - self.first < self.length:
+            return int(node) - self.first  # Row of the node
+        raise KeyError(node)
+
+    def __iter__(self):
+        return iter(range(self.first, self.first + self.length))
+
+    def __len__(self):
+        return self.length
+
+
+class _SortedIndex(Mapping):
+    """
+    This class maps node ids to rows with a binary search in a sorted copy of the ids.
+    It can replace the index dictionary when the ids are not contiguous and the buffers
+    are shared, so the worker processes of parallel.py do not each build a dictionary.
+    """
+
+    def __init__(self, ids, rows):
+        self.ids = ids  # Sorted node ids
+        self.rows = rows  # Row of every sorted id
+
+    def __getitem__(self, node):
+        if isinstance(node, (int, np.integer)):
+            i = bisect_left(self.ids, node)  # Position of the id
+            if i < len(self.ids) and self.ids[i] == node:
+                return self.rows[i]  # Row of the node
+        raise KeyError(node)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class _CSRAdjacency(Mapping):
+    """
+    This class is a read-only view of the CSR buffers that behaves like the adjacency
+    dictionary of the Graph class, so the search algorithms can run on it unchanged.
+    """
+
+    def __init__(self, csr):
+        self.csr = csr  # The CSRGraph object
+
+    def __getitem__(self, node):
+        """Returns an iterator over the (neighbor, weight) pairs of the given node."""
+        i = self.csr.index[node]  # Get the row of the node
+        start, end = self.csr.offsets[i], self.csr.offsets[i + 1]  # Row boundaries
+        return zip(
+            self.csr.neighbors[start:end], self.csr.weights[start:end]
+        )  # Pair the neighbors with the weights
+
+    def __iter__(self):
+        return iter(self.csr.node_ids)  # Iterate over the node ids
+
+    def __len__(self):
+        return len(self.csr.node_ids)  # Number of nodes
+
+    def __repr__(self):
+        return str({node: list(self[node]) for node in self})  # Same as the dictionary
+
+
+class _CSRCoordinates(Mapping):
+    """
+    This class is a read-only view of the coordinate buffers that behaves like the
+    node_coordinates dictionary of the Graph class.
+    """
+
+    def __init__(self, csr):
+        self.csr = csr  # The CSRGraph object
+
+    def __getitem__(self, node):
+        """Returns the (x, y) coordinates of the given node."""
+        i = self.csr.index[node]  # Get the row of the node
+        return (self.csr.xs[i], self.csr.ys[i])  # Return the coordinates
+
+    def __iter__(self):
+        return iter(self.csr.node_ids)  # Iterate over the node ids
+
+    def __len__(self):
+        return len(self.csr.node_ids)  # Number of nodes
+
+
+class CSRGraph(Graph):
+    """
+    This class represents a frozen graph in compressed sparse row (CSR) form. The neighbors
+    of the node in row i are neighbors[offsets[i]:offsets[i + 1]] and the weights of the
+    edges are stored at the same positions of weights. The neighbors of every row are
+    sorted, so an edge is found with a binary search. All buffers are contiguous arrays,
+    which takes a fraction of the memory of the dictionary of lists used by Graph.
+    The graph cannot be modified, but every search of the Graph class runs on it directly.
+
+    @attributes:
+        node_ids (array): id of the node in each row.
+        offsets (array): start of the neighbors of each row, with one extra element at the end.
+        neighbors (array): ids of the neighbors of all rows, one after another.
+        weights (array): weights of the edges, aligned with neighbors.
+        xs (array): x coordinate of the node in each row.
+        ys (array): y coordinate of the node in each row.
+        index (dict): A mapping from node ids to their rows.
+    """
+
+    def __init__(self, node_ids, offsets, neighbors, weights, xs, ys, index=None):
+        super().__init__()  # Inherit Graph class
+        self.node_ids = node_ids
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+        self.xs = xs
+        self.ys = ys
+        if index is None:
+            index = {node: i for i, node in enumerate(node_ids)}  # Map node ids to rows
+        self.index = index
+        self.max_weight = self.integer_weights = None  # See integer_weight_bound
+        self.graph = _CSRAdjacency(self)  # Adjacency view used by the searches
+        self.node_coordinates = _CSRCoordinates(self)  # Coordinate view
+
+    @classmethod
+    def from_graph(cls, g: Graph) -> "CSRGraph":
+        """Packs the adjacency lists of the given graph into CSR buffers.
+
+        Args:
+            g (Graph): graph to be packed
+
+        Returns:
+            csr (CSRGraph): frozen copy of the graph
+        """
+        node_ids = array("q", g.graph.keys())  # One row per node
+        offsets = array("q", [0])  # Start of the first row
+        neighbors = array("q")  # Neighbors of all rows
+        weight_values = []  # Weights of all rows
+        for node in node_ids:  # Iterate over the rows
+            for neighbor, weight in sorted(
+                g.graph[node], key=lambda edge: edge[0]
+            ):  # Iterate over the neighbors in sorted order
+                neighbors.append(neighbor)  # Add the neighbor
+                weight_values.append(weight)  # Add the weight
+            offsets.append(len(neighbors))  # End of the row
+        weights = array(_typecode(weight_values), weight_values)  # Pack the weights
+
+        x_values = [g.node_coordinates[node][0] for node in node_ids]  # x coordinates
+        y_values = [g.node_coordinates[node][1] for node in node_ids]  # y coordinates
+        xs = array(_typecode(x_values), x_values)  # Pack the x coordinates
+        ys = array(_typecode(y_values), y_values)  # Pack the y coordinates
+
+        return cls(node_ids, offsets, neighbors, weights, xs, ys)
+
+    @classmethod
+    def from_buffers(
+        cls,
+        node_ids,
+        offsets,
+        neighbors,
+        weights,
+        xs,
+        ys,
+        first=None,
+        sorted_ids=None,
+        sorted_rows=None,
+    ) -> "CSRGraph":
+        """Builds a CSRGraph on existing buffers, like memory-mapped or shared ones, without
+        copying them. If the first node id is given, the rows are computed from the ids;
+        otherwise, if the buffers of sorted_index are given, the rows are found with a
+        binary search in them; otherwise the index dictionary is built.
+
+        Args:
+            node_ids, offsets, neighbors, weights, xs, ys (array): CSR buffers
+            first (int): id of the first node if the ids are contiguous, see first_id
+            sorted_ids (array): sorted node ids, see sorted_index
+            sorted_rows (array): row of every sorted id, see sorted_index
+
+        Returns:
+            csr (CSRGraph): frozen graph on the buffers
+        """
+        index = None  # Index dictionary, built by __init__
+        if first is not None:  # Rows computed from the ids
+            index = _RangeIndex(first, len(node_ids))
+        elif sorted_ids is not None:  # Binary search in the sorted ids
+            index = _SortedIndex(sorted_ids, sorted_rows)
+        return cls(node_ids, offsets, neighbors, weights, xs, ys, index=index)
+
+    def sorted_index(self):
+        """Returns the node ids in sorted order and the row of each of them, the buffers
+        that from_buffers searches instead of building the index dictionary.
+
+        Returns:
+            sorted_ids (array): sorted node ids
+            sorted_rows (array): row of every sorted id
+        """
+        ids = np.frombuffer(self.node_ids, dtype=np.int64)  # No copy
+        rows = np.argsort(ids, kind="stable")  # Rows in the order of the ids
+        return _to_array(ids[rows]), _to_array(rows)
+
+    @classmethod
+    def from_edges(cls, nodes, xs, ys, sources, targets, weights) -> "CSRGraph":
+        """Builds the CSR buffers directly from NumPy arrays of nodes and undirected edges,
+        without going through the adjacency lists. It is used to build very large graphs.
+
+        Args:
+            nodes (np.ndarray): ids of the nodes
+            xs (np.ndarray): x coordinates of the nodes
+            ys (np.ndarray): y coordinates of the nodes
+            sources (np.ndarray): ids of the first nodes of the edges
+            targets (np.ndarray): ids of the second nodes of the edges
+            weights (np.ndarray): weights of the edges
+
+        Returns:
+            csr (CSRGraph): frozen graph
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)  # Make sure the inputs are arrays
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights)
+
+        heads = np.concatenate((sources, targets))  # Every edge in both directions
+        tails = np.concatenate((targets, sources))
+        doubled_weights = np.concatenate((weights, weights))
+
+        order = np.argsort(nodes, kind="stable")  # Sort the node ids to search them
+        positions = np.searchsorted(nodes[order], heads)  # Find the row of every edge
+        positions[positions == len(nodes)] = 0  # Keep the positions in bounds
+        rows = order[positions]  # Rows of the edges
+        if len(heads) and not np.array_equal(nodes[rows], heads):  # Unknown nodes
+            raise KeyError("edges refer to nodes that are not in the graph")
+
+        permutation = np.lexsort((tails, rows))  # Sort by row, then by neighbor
+        offsets = np.zeros(len(nodes) + 1, dtype=np.int64)  # Row boundaries
+        np.cumsum(np.bincount(rows, minlength=len(nodes)), out=offsets[1:])
+
+        return cls(
+            _to_array(nodes),
+            _to_array(offsets),
+            _to_array(tails[permutation]),
+            _to_array(doubled_weights[permutation]),
+            _to_array(np.asarray(xs)),
+            _to_array(np.asarray(ys)),
+        )
+
+    def add_node(self, node: int, x: int, y: int):
+        """CSRGraph is frozen, nodes cannot be added."""
+        raise TypeError("CSRGraph is frozen, nodes cannot be added")
+
+    def add_nodes_from(self, nodes, xs, ys):
+        """CSRGraph is frozen, nodes cannot be added."""
+        raise TypeError("CSRGraph is frozen, nodes cannot be added")
+
+    def add_edge(self, node1: int, node2: int, weight: int):
+        """CSRGraph is frozen, edges cannot be added."""
+        raise TypeError("CSRGraph is frozen, edges cannot be added")
+
+    def add_edges_from(self, sources, targets, weights):
+        """CSRGraph is frozen, edges cannot be added."""
+        raise TypeError("CSRGraph is frozen, edges cannot be added")
+
+    def update_edge_weight(self, node1: int, node2: int, weight: int):
+        """CSRGraph is frozen, edges cannot be changed."""
+        raise TypeError("CSRGraph is frozen, edges cannot be changed")
+
+    def remove_edge(self, node1: int, node2: int):
+        """CSRGraph is frozen, edges cannot be removed."""
+        raise TypeError("CSRGraph is frozen, edges cannot be removed")
+
+    def coordinate_arrays(self):
+        """Returns the coordinate buffers of the graph, which are already packed.
+
+        Returns:
+            index (dict): dictionary mapping nodes to their rows
+            xs (array): x coordinates of the nodes
+            ys (array): y coordinates of the nodes
+        """
+        return self.index, self.xs, self.ys
+
+    def _find_edge(self, node1: int, node2: int) -> int:
+        """Returns the position of the edge between the given nodes in the neighbors buffer.
+
+        Args:
+            node1 (int): id of the first node
+            node2 (int): id of the second node
+
+        Returns:
+            position (int): position of the edge, or -1 if there is no edge between the nodes
+        """
+        i = self.index.get(node1)  # Get the row of the first node
+        if i is None:  # If the first node is not in the graph,
+            return -1  # there is no edge.
+        end = self.offsets[i + 1]  # End of the row
+        position = bisect_left(
+            self.neighbors, node2, self.offsets[i], end
+        )  # Binary search in the sorted row
+        if position < end and self.neighbors[position] == node2:  # If it is found
+            return position  # Return the position of the edge
+        return -1  # Return -1 if there is no edge between the nodes
+
+    def get_edge_weight(self, node1: int, node2: int) -> int:
+        """Returns the weight of the edge between the given nodes in O(log d) time.
+
+        Args:
+            node1 (int): id of the first node
+            node2 (int): id of the second node
+
+        Returns:
+            weight (int): weight of the edge between the given nodes
+        """
+        position = self._find_edge(node1, node2)  # Find the edge
+        if position < 0:  # If there is no edge between the nodes
+            return float("inf")  # Return infinity
+        return self.weights[position]  # Return the weight of the edge
+
+    def has_edge(self, node1: int, node2: int) -> bool:
+        """Returns whether there is an edge between the given nodes in O(log d) time.
+
+        Args:
+            node1 (int): id of the first node
+            node2 (int): id of the second node
+
+        Returns:
+            has_edge (bool): whether there is an edge between the given nodes
+        """
+        return self._find_edge(node1, node2) >= 0  # Binary search in the sorted row
+
+    def integer_weight_bound(self):
+        """Returns the largest edge weight if all the weights are non-negative integers.
+        It is computed from the weights buffer at the first call.
+
+        Returns:
+            bound (int): largest weight, or None if a weight is not a non-negative integer
+        """
+        if self.integer_weights is None:  # Not computed yet
+            integer = memoryview(self.weights).format == "q"  # Typecode of the buffer
+            values = np.frombuffer(
+                self.weights, dtype=np.int64 if integer else np.float64
+            )
+            self.max_weight = values.max().item() if len(values) else 0
+            self.integer_weights = integer and (len(values) == 0 or values.min() >= 0)
+        return self.max_weight if self.integer_weights else None
+
+    def degree(self, node: int) -> int:
+        """Returns the number of edges of the given node, the length of its row."""
+        i = self.index[node]  # Get the row of the node
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def freeze(self) -> "CSRGraph":
+        """Returns the graph itself, since it is already frozen.
+
+        Returns:
+            csr (CSRGraph): the graph itself
+        """
+        return self
+
+    def nbytes(self) -> int:
+        """Returns the number of bytes used by the CSR buffers.
+
+        Returns:
+            nbytes (int): total size of the buffers in bytes
+        """
+        return sum(
+            memoryview(buffer).nbytes
+            for buffer in (
+                self.node_ids,
+                self.offsets,
+                self.neighbors,
+                self.weights,
+                self.xs,
+                self.ys,
+            )
+        )  # Sum the sizes of the buffers
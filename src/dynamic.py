@@ -0,0 +1,231 @@
+"""
+@description: This file contains the DynamicShortestPathTree class. It keeps the shortest path tree of a source up to date while edge weights change, repairing only the affected part of the tree.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import modules
+from min_heap import MinHeap
+
+## NOTE: Repair ##
+# The repair follows the dynamic algorithm of Ramalingam and Reps. After a batch of
+# changes is applied to the graph,
+#   1. a tree edge that became heavier or was removed invalidates the subtree below it:
+#      the distances of those nodes are forgotten, and every one of them gets the best
+#      distance through a neighbor outside the invalidated subtrees,
+#   2. an edge that became lighter or was added is relaxed in both directions,
+#   3. the nodes whose distance changed are processed in the order of their distance,
+#      like in dijkstra's algorithm, and relax their edges until no distance improves.
+# Nodes outside the invalidated subtrees and out of reach of the improvements are never
+# touched, so a few changes cost much less than a new search over the whole graph.
+
+
+class DynamicShortestPathTree:
+    """
+    This class maintains the distances and the parents of all the nodes reachable from a
+    source. The changes must be made through its methods, so the tree is repaired with
+    them. If the graph is changed in another way, the tree is rebuilt at the next call.
+
+    @attributes:
+        graph (Graph): The graph.
+        source (int): The source node.
+        distances (dict): Distance of every reachable node.
+        parents (dict): Parent of every reachable node, None for the source.
+        children (dict): Children of every node in the tree.
+        version (int): Version of the graph the tree belongs to.
+        repetition (int): Number of distance updates made by the last build or repair.
+    """
+
+    def __init__(self, graph, source: int):
+        if source not in graph.graph:  # Check the source
+            raise KeyError(f"Node {source!r} is not in the graph")
+        self.graph = graph
+        self.source = source
+        self.build()
+
+    def build(self):
+        """
+        This function computes the tree from scratch with dijkstra's algorithm.
+
+        Returns:
+            None
+        """
+        self.distances = {self.source: 0}
+        self.parents = {self.source: None}
+        self.children = {}
+        self.repetition = 0
+        heap = MinHeap()
+        heap.push((0, self.source))  # (distance, node)
+        self._propagate(heap)
+        self.version = self.graph.version
+
+    def _set_parent(self, node: int, parent: int):
+        """Moves the node under a new parent in the tree."""
+        old_parent = self.parents.get(node)
+        if old_parent is not None:
+            self.children[old_parent].discard(node)
+        self.parents[node] = parent
+        if parent is not None:
+            self.children.setdefault(parent, set()).add(node)
+
+    def _relax(self, heap: MinHeap, node: int, neighbor: int, weight):
+        """Improves the distance of the neighbor through the node, if it is shorter."""
+        distance = self.distances.get(node)
+        if distance is None:  # The node is not reachable
+            return
+        new_distance = distance + weight
+        if new_distance < self.distances.get(neighbor, float("inf")):
+            self.repetition += 1  # Increment the number of repetitions
+            self.distances[neighbor] = new_distance  # Update the distance
+            self._set_parent(neighbor, node)  # Update the parent
+            if heap.contains(neighbor):  # If the neighbor is in the heap
+                heap.decrease_key(neighbor, new_distance)  # decrease its key
+            else:  # Otherwise, it must relax its edges again
+                heap.push((new_distance, neighbor))
+
+    def _propagate(self, heap: MinHeap):
+        """Relaxes the edges of the nodes in the heap until no distance improves."""
+        graph = self.graph.graph
+        while heap.heap:
+            _, node = heap.pop()  # The node with the smallest distance
+            for neighbor, weight in graph[node]:
+                self._relax(heap, node, neighbor, weight)
+
+    def _invalidate(self, roots, heap: MinHeap):
+        """
+        This function forgets the distances of the subtrees below the given nodes and
+        pushes every node of the subtrees with its best distance through the rest of the
+        tree.
+
+        Args:
+            roots (set): Roots of the subtrees
+            heap (MinHeap): Heap of the repair
+
+        Returns:
+            None
+        """
+        affected, stack = set(), list(roots)  # Nodes of the subtrees
+        while stack:
+            node = stack.pop()
+            if node not in affected:
+                affected.add(node)
+                stack.extend(self.children.get(node, ()))
+        for node in affected:  # Forget the distances
+            self._set_parent(node, None)
+            del self.distances[node], self.parents[node]
+        graph, distances = self.graph.graph, self.distances
+        for node in affected:  # Best distance through the rest of the tree
+            best, parent = float("inf"), None
+            for neighbor, weight in graph[node]:
+                distance = distances.get(neighbor)
+                if distance is not None and distance + weight < best:
+                    best, parent = distance + weight, neighbor
+            if parent is not None:
+                self.repetition += 1
+                distances[node] = best
+                self._set_parent(node, parent)
+                heap.push((best, node))
+
+    def apply(self, changes) -> int:
+        """
+        This function applies a batch of edge changes to the graph and repairs the tree.
+        A change (node1, node2, weight) sets the weight of the edge, and adds the edge if
+        it does not exist. A change (node1, node2, None) removes the edge.
+
+        Args:
+            changes (list): (node1, node2, weight) changes
+
+        Returns:
+            repetition (int): Number of distance updates made by the repair
+        """
+        if self.version != self.graph.version:  # Changed in another way
+            self.build()
+        roots, lighter = set(), []  # Invalidated subtrees and improved edges
+        for node1, node2, weight in changes:
+            if weight is None:  # Remove the edge
+                old_weight = self.graph.remove_edge(node1, node2)
+            elif self.graph.has_edge(node1, node2):  # Change the weight
+                old_weight = self.graph.update_edge_weight(node1, node2, weight)
+            else:  # Add the edge
+                self.graph.add_edge(node1, node2, weight)
+                old_weight = float("inf")
+            if weight is None or weight > old_weight:  # A tree edge may be longer
+                if self.parents.get(node2) == node1:
+                    roots.add(node2)
+                if self.parents.get(node1) == node2:
+                    roots.add(node1)
+            elif weight < old_weight:  # A path may be shorter
+                lighter.append((node1, node2))
+
+        self.repetition = 0
+        heap = MinHeap()
+        self._invalidate(roots, heap)
+        for node1, node2 in lighter:  # Relax the lighter edges
+            weight = self.graph.get_edge_weight(node1, node2)  # After the whole batch
+            self._relax(heap, node1, node2, weight)
+            self._relax(heap, node2, node1, weight)
+        self._propagate(heap)
+        self.version = self.graph.version
+        return self.repetition
+
+    def update_edge_weight(self, node1: int, node2: int, weight) -> int:
+        """
+        This function changes the weight of an edge and repairs the tree.
+
+        Args:
+            node1 (int): id of the first node
+            node2 (int): id of the second node
+            weight (int): new weight of the edge
+
+        Returns:
+            repetition (int): Number of distance updates made by the repair
+        """
+        return self.apply([(node1, node2, weight)])
+
+    def remove_edge(self, node1: int, node2: int) -> int:
+        """
+        This function removes an edge and repairs the tree.
+
+        Args:
+            node1 (int): id of the first node
+            node2 (int): id of the second node
+
+        Returns:
+            repetition (int): Number of distance updates made by the repair
+        """
+        return self.apply([(node1, node2, None)])
+
+    def query(self, target: int, viz: bool = False):
+        """
+        This function returns the shortest path from the source to the target.
+
+        Args:
+            target (int): Target node
+            viz (bool): Whether the predecessor of the source should be None
+
+        Returns:
+            metrics (dict): dictionary containing the number of visited nodes, the number of
+                repetitions, the path and the distance of the shortest path from the source
+                to the target node in the graph
+        """
+        if self.version != self.graph.version:  # Changed in another way
+            self.build()
+        metrics = {"visited": 0, "repetition": 0, "path": [], "distance": 0}
+        if target not in self.distances:  # The target is not reachable
+            return metrics
+
+        path = [target]  # Follow the parents back to the source
+        while path[-1] != self.source:
+            path.append(self.parents[path[-1]])
+        path.reverse()
+
+        predecessor = {self.source: None if viz else self.source}
+        for previous, node in zip(path, path[1:]):
+            predecessor[node] = previous
+        metrics["visited"] = len(path)  # Set the number of visited nodes
+        metrics["path"] = path  # Set the path
+        metrics["distance"] = self.distances[target]  # Set the distance
+        metrics["predecessor"] = predecessor  # Set the predecessor mapping
+        return metrics
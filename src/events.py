@@ -0,0 +1,112 @@
+"""
+@description: This file contains the EventMinHeap and SearchRecorder classes. They stream the steps of a search to a callback, for tracers, profilers and visualizations.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import modules
+from stats import CountingMinHeap
+
+## NOTE: Events ##
+# A search called with on_event=callback calls callback(event, node, key, side) for
+#   "push":   the node is reached for the first time and enters the heap with the key,
+#   "relax":  a shorter path to a node in the heap is found, and its key decreases,
+#   "settle": the node leaves the heap with the key, and its distance is final.
+# The key is the distance for dijkstra and f = g + h for A*. The side is 0, except for
+# the backward search of the bidirectional algorithms, where it is 1.
+# The events are emitted by the heap of the search, so a search without a callback uses
+# a plain MinHeap and pays nothing. Eager dijkstra pushes every node with an infinite key
+# before the search starts; such a push is not reported, and the node is reported as
+# pushed when its key first decreases to a finite distance. A node that is never reached
+# and leaves the heap with an infinite key emits no event at all.
+
+
+class EventMinHeap(CountingMinHeap):
+    """
+    This class is a heap that reports its operations to a callback as search events.
+    It also counts them like CountingMinHeap.
+
+    @attributes:
+        on_event (function): Function (event, node, key, side) called for every event.
+        side (int): Side of the search, passed to the callback.
+        unreached (set): Nodes in the heap with an infinite key, not reported yet.
+    """
+
+    def __init__(self, on_event, side, stats):
+        super().__init__(stats)  # Inherit CountingMinHeap class
+        self.on_event = on_event
+        self.side = side
+        self.unreached = set()
+
+    def clear(self):
+        super().clear()
+        self.unreached = set()
+
+    def push(self, val):
+        super().push(val)
+        if val[0] == float("inf"):  # Not reached yet, reported when it is
+            self.unreached.add(val[1])
+        else:
+            self.on_event("push", val[1], val[0], self.side)
+
+    def pop(self):
+        val = super().pop()
+        if val[1] in self.unreached:  # Never reached, nothing to report
+            self.unreached.discard(val[1])
+        else:
+            self.on_event("settle", val[1], val[0], self.side)
+        return val
+
+    def decrease_key(self, node, new_distance):
+        if node in self.position:  # Only a node in the heap can be decreased
+            super().decrease_key(node, new_distance)
+            if node in self.unreached:  # The first finite key
+                self.unreached.discard(node)
+                self.on_event("push", node, new_distance, self.side)
+            else:
+                self.on_event("relax", node, new_distance, self.side)
+
+
+class SearchRecorder:
+    """
+    This class is an event callback that records the events of a search in order.
+
+    @attributes:
+        events (list): (event, node, key, side) tuples, in the order they happened.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event: str, node: int, key, side: int = 0):
+        self.events.append((event, node, key, side))
+
+    def settled(self, side: int = None):
+        """
+        This function returns the settled nodes in the order the search settled them.
+
+        Args:
+            side (int): Only the nodes of this side, both sides by default
+
+        Returns:
+            nodes (list): Settled nodes
+        """
+        return [
+            node
+            for event, node, _, event_side in self.events
+            if event == "settle" and (side is None or event_side == side)
+        ]
+
+    def counts(self) -> dict:
+        """
+        This function returns the number of events of every kind.
+
+        Returns:
+            counts (dict): Number of "push", "relax" and "settle" events
+        """
+        counts = {"push": 0, "relax": 0, "settle": 0}
+        for event, _, _, _ in self.events:
+            counts[event] += 1
+        return counts
@@ -0,0 +1,153 @@
+"""
+@description: This file contains vectorized generators for synthetic graphs. They are used to build large benchmark graphs.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import numpy as np
+
+# Import modules
+from graph import Graph
+from csr_graph import CSRGraph
+
+# Every generator returns the arrays (nodes, xs, ys, sources, targets, weights).
+# Nodes are numbered from 1 to N, like in initialize_graph.
+
+
+def banded_arrays(N: int, bandwidth: int = 3):
+    """
+    This function generates the banded graph of the assignment: every node i is
+    connected to the nodes i + 1, ..., i + bandwidth with an edge of weight i + j.
+    The nodes are placed on two rows, and the edges are in the same order as the
+    nested loop of initialize_graph.
+
+    Args:
+        N (int): Number of nodes
+        bandwidth (int): Largest difference between the ids of two neighbors
+
+    Returns:
+        arrays (tuple): (nodes, xs, ys, sources, targets, weights)
+    """
+    nodes = np.arange(1, N + 1, dtype=np.int64)  # Node ids
+    xs = (nodes - 1) // 2  # x coordinates
+    ys = (nodes - 1) % 2  # y coordinates
+
+    sources = np.repeat(nodes, bandwidth)  # Every node bandwidth times
+    targets = sources + np.tile(
+        np.arange(1, bandwidth + 1, dtype=np.int64), N
+    )  # Followed by its next nodes
+    inside = targets <= N  # Drop the neighbors after the last node
+    sources, targets = sources[inside], targets[inside]
+    return nodes, xs, ys, sources, targets, sources + targets
+
+
+def grid_arrays(N: int, max_weight: int = 10, seed: int = 0):
+    """
+    This function generates a grid graph with about N nodes. Every node is connected
+    to its right and upper neighbors with a random integer weight between 1 and
+    max_weight, so the coordinate heuristics are admissible on it.
+
+    Args:
+        N (int): Number of nodes, rounded down to a full grid
+        max_weight (int): Largest edge weight
+        seed (int): Seed of the random number generator
+
+    Returns:
+        arrays (tuple): (nodes, xs, ys, sources, targets, weights)
+    """
+    rng = np.random.default_rng(seed)  # Random number generator
+    columns = max(int(np.sqrt(N)), 1)  # Width of the grid
+    rows = max(N // columns, 1)  # Height of the grid
+    nodes = np.arange(1, rows * columns + 1, dtype=np.int64)  # Node ids
+    xs = (nodes - 1) % columns  # x coordinates
+    ys = (nodes - 1) // columns  # y coordinates
+
+    right = nodes[xs < columns - 1]  # Nodes that have a right neighbor
+    up = nodes[ys < rows - 1]  # Nodes that have an upper neighbor
+    sources = np.concatenate((right, up))
+    targets = np.concatenate((right + 1, up + columns))
+    weights = rng.integers(1, max_weight + 1, size=len(sources))  # Random weights
+    return nodes, xs, ys, sources, targets, weights
+
+
+def random_arrays(N: int, degree: int = 4, seed: int = 0):
+    """
+    This function generates a random geometric graph. The nodes are placed uniformly
+    on a square and every node is connected to degree random nodes. The weight of an
+    edge is its Euclidean length rounded up, plus one, so it is never shorter than
+    the straight line between the nodes.
+
+    Args:
+        N (int): Number of nodes
+        degree (int): Number of edges added per node
+        seed (int): Seed of the random number generator
+
+    Returns:
+        arrays (tuple): (nodes, xs, ys, sources, targets, weights)
+    """
+    rng = np.random.default_rng(seed)  # Random number generator
+    side = int(np.sqrt(N)) + 1  # Size of the square
+    nodes = np.arange(1, N + 1, dtype=np.int64)  # Node ids
+    xs = rng.integers(0, side, size=N)  # x coordinates
+    ys = rng.integers(0, side, size=N)  # y coordinates
+
+    sources = np.repeat(nodes, degree)  # Every node degree times
+    targets = rng.integers(1, N + 1, size=len(sources))  # Random neighbors
+    distinct = sources != targets  # Drop the loops
+    sources, targets = sources[distinct], targets[distinct]
+    dx = xs[sources - 1] - xs[targets - 1]
+    dy = ys[sources - 1] - ys[targets - 1]
+    weights = np.ceil(np.sqrt(dx * dx + dy * dy)).astype(np.int64) + 1  # Edge lengths
+    return nodes, xs, ys, sources, targets, weights
+
+
+FAMILIES = {
+    "banded": banded_arrays,
+    "grid": grid_arrays,
+    "random": random_arrays,
+}  # Graph families by name
+
+
+def load_arrays(g: Graph, arrays) -> Graph:
+    """
+    This function loads the generated arrays into the given graph with one batch call
+    for the nodes and one for the edges.
+
+    Args:
+        g (Graph): Graph object
+        arrays (tuple): (nodes, xs, ys, sources, targets, weights)
+
+    Returns:
+        g (Graph): The same graph, with the nodes and edges added
+    """
+    nodes, xs, ys, sources, targets, weights = arrays
+    g.add_nodes_from(nodes.tolist(), xs.tolist(), ys.tolist())  # Python ints
+    g.add_edges_from(sources.tolist(), targets.tolist(), weights.tolist())
+    return g
+
+
+def build_graph(family: str, N: int, frozen: bool = False, **options):
+    """
+    This function builds a synthetic graph of the given family. Frozen graphs are
+    built directly from the arrays, which takes seconds even for millions of nodes.
+
+    Args:
+        family (str): Name of the graph family, one of FAMILIES
+        N (int): Number of nodes
+        frozen (bool): Whether to return a CSRGraph instead of a Graph
+        **options: Options of the generator of the family
+
+    Returns:
+        g (Graph or CSRGraph): Generated graph
+    """
+    if family not in FAMILIES:  # Check the family name
+        raise ValueError(
+            f"Unknown graph family {family!r}, expected one of {sorted(FAMILIES)}"
+        )
+    arrays = FAMILIES[family](N, **options)  # Generate the arrays
+    if frozen:  # Build the CSR buffers directly
+        return CSRGraph.from_edges(*arrays)
+    return load_arrays(Graph(), arrays)  # Load the arrays into a new graph
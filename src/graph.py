@@ -7,35 +7,182 @@
 """
 
 # Import libraries
+import copy
 import matplotlib.pyplot as plt
-from typing import Dict, List, Tuple
+import os
+import time
+import numpy as np
+from array import array
+from typing import Dict, Iterator, List, Tuple
 from math import sqrt
 
 # Import modules
 from min_heap import MinHeap
+from heuristics import get_heuristic
+from landmarks import Landmarks
+from cache import LRUCache, MISSING
+from search_tree import SearchTreePool
+from stats import CountingMinHeap, SearchStats, StatsCollector
+from events import EventMinHeap
+from queues import get_queue, prefers_buckets, with_queue
 
 # from utils import visualize_graph, visualize_shortest_path
 
 
-class Graph(MinHeap):
+def _copy_metrics(metrics: dict) -> dict:
+    """Returns a copy of the metrics of a search that shares no list or dictionary with
+    them, so the cached metrics and the returned ones can be changed independently. On a
+    cache hit, the statistics are the ones of the search that computed the result.
+
+    Args:
+        metrics (dict): metrics of a search
+    Returns:
+        copied (dict): copy of the metrics, with copies of the path, the predecessors
+            and the statistics
+    """
+    copied = dict(metrics)  # the numbers are immutable
+    copied["path"] = list(metrics["path"])
+    if "predecessor" in metrics:
+        copied["predecessor"] = dict(metrics["predecessor"])
+    if "stats" in metrics:
+        copied["stats"] = copy.copy(metrics["stats"])
+    return copied
+
+
+def _cached_query(search):
+    """Decorator that serves a search method from the query cache of the graph.
+    The key is the name of the method and all its arguments, so each algorithm and each
+    option has its own entries. Queries with unhashable arguments, and queries with an
+    event callback, which must see the events of a real search, are not cached.
+
+    Args:
+        search (function): search method of the Graph class
+
+    Returns:
+        cached_search (function): the search method with caching
+    """
+
+    def cached_search(self, source, target, *args, **kwargs):
+        cache = self.cache  # read once, another thread may disable the cache
+        if cache is None or kwargs.get("on_event") is not None:  # no caching
+            return search(self, source, target, *args, **kwargs)
+        key = (search.__name__, source, target, args, tuple(sorted(kwargs.items())))
+        version = self.version  # the version the result is computed on
+        try:
+            metrics = cache.get(key, version)  # look the query up
+        except TypeError:  # unhashable argument, e.g. a list
+            return search(self, source, target, *args, **kwargs)
+        if metrics is MISSING:  # run the search and store a copy of the result
+            metrics = search(self, source, target, *args, **kwargs)
+            cache.put(key, _copy_metrics(metrics), version)
+            return metrics
+        collector = self.stats_collector
+        if collector is not None:  # a hit did no search, only the hit is counted
+            collector.add_hit()
+        return _copy_metrics(metrics)  # a copy, so the caller cannot change the cache
+
+    cached_search.__name__ = search.__name__
+    cached_search.__qualname__ = search.__qualname__
+    cached_search.__doc__ = search.__doc__
+    cached_search.__wrapped__ = search  # for inspect.signature
+    return cached_search
+
+
+def _find_entry(row: List[Tuple[int, int]], node: int, start: int = 0) -> int:
+    """Returns the position of the first entry of the node in a neighbors list.
+
+    Args:
+        row (list): (neighbor, weight) pairs of a node
+        node (int): neighbor to be found
+        start (int): position where the search starts
+
+    Returns:
+        position (int): position of the entry, or -1 if the node is not in the list
+    """
+    for position in range(start, len(row)):  # Iterate over the entries
+        if row[position][0] == node:  # If the entry belongs to the node
+            return position
+    return -1
+
+
+class Graph:
     """
     This class represents a graph data structure, with support for adding and accessing
     nodes and edges, as well as performing dijkstra and A* searches.
+    Every search keeps its heap, distances and parents in local variables and returns them
+    in its metrics, so one graph can serve many threads at once as long as it is not
+    modified during the queries.
 
     @attributes:
         graph (dict): A dictionary mapping nodes to a list of their neighbors and the weights
             of their edges.
         node_coordinates (dict): A dictionary mapping nodes to their x and y coordinates.
-        a_star_parents (dict): A dictionary used to store the parent nodes during A* search.
-        dijkstra_parents (dict): A dictionary used to store the parent nodes during dijkstra search.
+        edge_weights (dict): A dictionary mapping (node1, node2) pairs to the weights of
+            their edges, in both directions.
+        landmarks (Landmarks): Preprocessing of the "landmarks" heuristic, see preprocess_landmarks.
+        version (int): Number of changes made to the graph, used to invalidate derived data.
+        cache (LRUCache): Cache of query results, None unless enable_cache is called.
+        search_trees (SearchTreePool): Suspended searches of resumable_dijkstra.
+        stats_collector (StatsCollector): Totals of the search statistics, None unless
+            enable_stats is called.
+        max_weight (int): An upper bound of the edge weights, the largest weight added.
+        integer_weights (bool): Whether all the weights added are non-negative integers.
     """
 
     def __init__(self):
-        super().__init__()  # Inherit MinHeap class
         self.graph = {}
         self.node_coordinates = {}
-        self.a_star_parents = {}
-        self.dijkstra_parents = {}
+        self.edge_weights = {}
+        self._coordinate_arrays = None  # Cache of coordinate_arrays()
+        self.landmarks = None
+        self.version = 0
+        self.cache = None
+        self.search_trees = None
+        self.stats_collector = None
+        self.max_weight = 0
+        self.integer_weights = True
+
+    def _changed(self):
+        """Records a change of the nodes or edges. The version is incremented, which
+        invalidates the query cache, and the landmark distances are dropped.
+
+        Returns:
+            None
+        """
+        self.version += 1  # new version of the graph
+        self.landmarks = None  # the landmark distances are out of date
+
+    def enable_cache(self, maxsize: int = 1024) -> LRUCache:
+        """Enables the cache of query results. The results of dijkstra, a_star and the
+        bidirectional searches are stored by algorithm and arguments, and the least
+        recently used results are evicted when the cache is full. The cache is emptied
+        automatically when a node or an edge is added.
+
+        Args:
+            maxsize (int): largest number of cached results
+        Returns:
+            cache (LRUCache): the cache, also stored in self.cache
+        """
+        self.cache = LRUCache(maxsize)  # create an empty cache
+        self.cache.version = self.version  # for the current version of the graph
+        return self.cache
+
+    def disable_cache(self):
+        """Disables the cache of query results and drops the cached results.
+
+        Returns:
+            None
+        """
+        self.cache = None
+
+    def cache_stats(self) -> dict:
+        """Returns the statistics of the query cache.
+
+        Returns:
+            stats (dict): size, maxsize, hits, misses, evictions, invalidations and the
+                hit rate of the cache, or None if caching is disabled
+        """
+        return None if self.cache is None else self.cache.stats()
 
     def add_node(self, node: int, x: int, y: int):
         """Adds a node to the graph.
@@ -53,6 +200,27 @@ class Graph(MinHeap):
             x,
             y,
         )  # Add the node's coordinates to the dictionary
+        self._coordinate_arrays = None  # The coordinates have changed
+        self._changed()  # Invalidate the cache and the landmarks
+
+    def add_nodes_from(self, nodes: List[int], xs: List[int], ys: List[int]):
+        """Adds many nodes to the graph in one call.
+
+        Args:
+            nodes (list): nodes to be added
+            xs (list): x coordinates of the nodes
+            ys (list): y coordinates of the nodes
+
+        Returns:
+            None
+        """
+        graph = self.graph  # Local references are faster in the loop
+        node_coordinates = self.node_coordinates
+        for node, x, y in zip(nodes, xs, ys):  # Iterate over the nodes
+            graph[node] = []  # Initialize the node's neighbors list
+            node_coordinates[node] = (x, y)  # Add the node's coordinates
+        self._coordinate_arrays = None  # The coordinates have changed
+        self._changed()  # Invalidate the cache and the landmarks
 
     def get_node(self, node: int) -> int:
         """Returns the node with the given id.
@@ -86,6 +254,25 @@ class Graph(MinHeap):
         """
         return self.node_coordinates[node]  # Return the node's coordinates
 
+    def coordinate_arrays(self) -> Tuple[Dict[int, int], array, array]:
+        """Returns the coordinates of all nodes packed into arrays. The arrays are
+        computed once and reused until a node is added. They are used by the
+        coordinate heuristics of A*.
+
+        Returns:
+            index (dict): dictionary mapping nodes to their positions in the arrays
+            xs (array): x coordinates of the nodes
+            ys (array): y coordinates of the nodes
+        """
+        if self._coordinate_arrays is None:  # If the arrays are not computed yet
+            index = {
+                node: i for i, node in enumerate(self.node_coordinates)
+            }  # Position of every node
+            xs = array("d", (x for x, _ in self.node_coordinates.values()))
+            ys = array("d", (y for _, y in self.node_coordinates.values()))
+            self._coordinate_arrays = (index, xs, ys)  # Cache the arrays
+        return self._coordinate_arrays  # Return the arrays
+
     def get_edge_weight(self, node1: int, node2: int) -> int:
         """Returns the weight of the edge between the given nodes.
 
@@ -96,12 +283,9 @@ class Graph(MinHeap):
         Returns:
             weight (int): weight of the edge between the given nodes
         """
-        for neighbor, weight in self.graph[
-            node1
-        ]:  # Iterate over the neighbors of the first node
-            if neighbor == node2:  # If the neighbor is the second node
-                return weight  # Return the weight of the edge
-        return float("inf")  # Return infinity if there is no edge between the nodes
+        return self.edge_weights.get(
+            (node1, node2), float("inf")
+        )  # Return infinity if there is no edge between the nodes
 
     def add_edge(self, node1: int, node2: int, weight: int):
         """Adds an edge between the given nodes.
@@ -117,23 +301,154 @@ class Graph(MinHeap):
         self.graph[node2].append(
             (node1, weight)
         )  # Add the first node to the second node's neighbors list
+        self.edge_weights.setdefault(
+            (node1, node2), weight
+        )  # Index the edge, the first edge between two nodes is kept
+        self.edge_weights.setdefault((node2, node1), weight)  # in both directions
+        self._track_weights((weight,))  # Bound of the weights
+        self._changed()  # Invalidate the cache and the landmarks
+
+    def add_edges_from(
+        self, sources: List[int], targets: List[int], weights: List[int]
+    ):
+        """Adds many edges to the graph in one call. The result is the same as
+        calling add_edge for every (source, target, weight) triple in order.
 
-    def get_edges(self) -> List[Tuple[int, int]]:
-        """Returns a list of all edges in the graph.
+        Args:
+            sources (list): ids of the first nodes of the edges
+            targets (list): ids of the second nodes of the edges
+            weights (list): weights of the edges
 
         Returns:
-            edges (list): list of all edges in the graph
+            None
         """
-        edges = []  # Initialize the list of edges
+        graph = self.graph  # Local references are faster in the loop
+        edge_weights = self.edge_weights
+        max_weight, integer = self.max_weight, self.integer_weights  # Weight bound
+        for node1, node2, weight in zip(
+            sources, targets, weights
+        ):  # Iterate over the edges
+            graph[node1].append((node2, weight))  # Add both directions
+            graph[node2].append((node1, weight))  # to the neighbors lists
+            edge_weights.setdefault((node1, node2), weight)  # Index the edge
+            edge_weights.setdefault((node2, node1), weight)  # in both directions
+            if weight > max_weight or (
+                integer and (weight < 0 or type(weight) is not int)
+            ):  # Rare, only when the bound changes
+                self._track_weights((weight,))
+                max_weight, integer = self.max_weight, self.integer_weights
+        self._changed()  # Invalidate the cache and the landmarks
+
+    def update_edge_weight(self, node1: int, node2: int, weight: int) -> int:
+        """Changes the weight of the edge between the given nodes. If there are parallel
+        edges, the first one is changed, which is the one indexed by edge_weights.
+
+        Args:
+            node1 (int): id of the first node
+            node2 (int): id of the second node
+            weight (int): new weight of the edge
+        Returns:
+            old_weight (int): weight of the edge before the change
+        """
+        row1, row2 = self.graph[node1], self.graph[node2]  # Neighbors lists
+        i = _find_entry(row1, node2)  # Position of the edge in the first list
+        if i < 0:  # If there is no edge between the nodes
+            raise KeyError(f"There is no edge between {node1} and {node2}")
+        j = _find_entry(
+            row2, node1, i + 1 if node1 == node2 else 0
+        )  # Position in the second list, a loop is stored twice in the same list
+        old_weight = row1[i][1]
+        row1[i] = (node2, weight)  # Change both directions
+        row2[j] = (node1, weight)
+        self.edge_weights[(node1, node2)] = weight  # Change the edge index
+        self.edge_weights[(node2, node1)] = weight  # in both directions
+        self._track_weights((weight,))  # Bound of the weights
+        self._changed()  # Invalidate the cache and the landmarks
+        return old_weight
+
+    def remove_edge(self, node1: int, node2: int) -> int:
+        """Removes the edge between the given nodes. If there are parallel edges, the
+        first one is removed and the next one is indexed by edge_weights.
+
+        Args:
+            node1 (int): id of the first node
+            node2 (int): id of the second node
+        Returns:
+            weight (int): weight of the removed edge
+        """
+        row1, row2 = self.graph[node1], self.graph[node2]  # Neighbors lists
+        i = _find_entry(row1, node2)  # Position of the edge in the first list
+        if i < 0:  # If there is no edge between the nodes
+            raise KeyError(f"There is no edge between {node1} and {node2}")
+        weight = row1.pop(i)[1]  # Remove both directions
+        del row2[_find_entry(row2, node1)]  # For a loop, the other copy in the list
+        i = _find_entry(row1, node2)  # Next parallel edge
+        if i < 0:  # If it was the last edge between the nodes, drop it from the index
+            self.edge_weights.pop((node1, node2), None)
+            self.edge_weights.pop((node2, node1), None)
+        else:  # Otherwise, index the next edge
+            self.edge_weights[(node1, node2)] = row1[i][1]
+            self.edge_weights[(node2, node1)] = row1[i][1]
+        self._changed()  # Invalidate the cache and the landmarks
+        return weight
+
+    def _track_weights(self, weights):
+        """Updates max_weight and integer_weights with the weights of new edges. The bound
+        is not lowered when an edge is removed or made lighter, so it stays valid.
+
+        Args:
+            weights (iterable): weights of the edges
+        Returns:
+            None
+        """
+        for weight in weights:
+            if weight > self.max_weight:  # new bound
+                self.max_weight = weight
+            if type(weight) is not int or weight < 0:  # not a bucket index
+                self.integer_weights = False
+
+    def integer_weight_bound(self):
+        """Returns the largest edge weight if all the weights are non-negative integers,
+        which lets dijkstra use a bucket queue, see queues.BucketQueue.
+
+        Returns:
+            bound (int): upper bound of the weights, or None if a weight is not a
+                non-negative integer
+        """
+        return self.max_weight if self.integer_weights else None
+
+    def iter_edges(self) -> Iterator[Tuple[int, int, int]]:
+        """Yields every undirected edge of the graph exactly once, with its weight.
+        It runs in O(E) time and does not build a list of the edges. Parallel edges
+        between two nodes are yielded once, with the weight of the first one.
+
+        Yields:
+            edge (tuple): (node1, node2, weight) of an edge of the graph
+        """
+        done = set()  # Nodes whose edges have already been yielded
         for node in self.graph.keys():  # Iterate over the nodes in the graph
-            for neighbor, _ in self.graph[
+            seen = set()  # Neighbors of the current node that have been yielded
+            for neighbor, weight in self.graph[
                 node
             ]:  # Iterate over the neighbors of the current node
                 if (
-                    node,
-                    neighbor,
-                ) not in edges:  # If the edge is not in the list of edges
-                    edges.append((node, neighbor))  # Add the edge to the list of edges
+                    neighbor not in done and neighbor not in seen
+                ):  # If the edge has not been yielded from either end
+                    seen.add(neighbor)  # Mark the neighbor
+                    yield node, neighbor, weight  # Yield the edge
+            done.add(node)  # All edges of the current node have been yielded
+
+    def get_edges(self) -> List[Tuple[int, int]]:
+        """Returns a list of all edges in the graph, in both directions.
+
+        Returns:
+            edges (list): list of all edges in the graph
+        """
+        edges = []  # Initialize the list of edges
+        for node, neighbor, _ in self.iter_edges():  # Iterate over the edges
+            edges.append((node, neighbor))  # Add the edge to the list of edges
+            if neighbor != node:  # If the edge is not a loop
+                edges.append((neighbor, node))  # add it in the other direction too
         return edges  # Return the list of edges
 
     def has_edge(self, node1: int, node2: int) -> bool:
@@ -145,12 +460,17 @@ class Graph(MinHeap):
         Returns:
             has_edge (bool): whether there is an edge between the given nodes
         """
-        for neighbor, _ in self.graph[
-            node1
-        ]:  # Iterate over the neighbors of the first node
-            if neighbor == node2:  # If the neighbor is the second node
-                return True  # Return True
-        return False  # Return False if there is no edge between the nodes
+        return (node1, node2) in self.edge_weights  # Look up the edge index
+
+    def degree(self, node: int) -> int:
+        """Returns the number of edges of the given node, counting parallel edges.
+
+        Args:
+            node (int): id of the node
+        Returns:
+            degree (int): number of edges of the node
+        """
+        return len(self.graph[node])  # length of the neighbors list
 
     def get_neighbors(self, node: int) -> List[int]:
         """Returns a list of the neighbors of the given node.
@@ -165,7 +485,28 @@ class Graph(MinHeap):
             neighbor for neighbor, _ in self.graph[node]
         ]  # Return the list of neighbors of the given node
 
-    def dijkstra(self, source: int, target: int, viz=False) -> Tuple[List[int], int]:
+    def freeze(self):
+        """Returns a frozen copy of the graph in compressed sparse row (CSR) form.
+        The copy stores the adjacency lists in contiguous arrays and supports the
+        same searches, but it cannot be modified.
+
+        Returns:
+            csr (CSRGraph): frozen copy of the graph
+        """
+        from csr_graph import CSRGraph  # Imported here to avoid a circular import
+
+        return CSRGraph.from_graph(self)  # Pack the adjacency lists into arrays
+
+    @_cached_query
+    def dijkstra(
+        self,
+        source: int,
+        target: int,
+        viz=False,
+        lazy: bool = False,
+        on_event=None,
+        queue=None,
+    ) -> Tuple[List[int], int]:
         """Performs dijkstra search on the graph. Returns the shortest path from the source.
         It uses a min heap to keep track of the distances to the nodes. It iterates over the
         nodes in the heap and updates the distances to the neighbors of the current node.
@@ -174,27 +515,47 @@ class Graph(MinHeap):
         If it is, it adds the current node to the path. Thirdly, it checks if the current node
         is not the source node. If it is not, it adds the current node to the path and updates
         the distance. Lastly, it updates the distances to the neighbors of the current node.
+        In lazy mode, nodes are pushed to the heap only when they are first reached, so the
+        cost of a query depends on the explored region instead of the size of the graph.
 
         Args:
             source (int): id of the source node
             target (int): id of the target node
             viz (bool): whether to visualize the search
+            lazy (bool): whether to push nodes to the heap only when they are first reached
+            on_event (function): callback (event, node, key, side) that receives the
+                "push", "relax" and "settle" events of the search, see events.py
+            queue (str or class): priority queue of the search, "binary" (MinHeap),
+                "4-ary", "pairing", "radix" or "dial", see queues.py. By default, the
+                bucket queue of Dial's algorithm is used when all the weights are small
+                integers compared to the size of the graph, see queues.prefers_buckets,
+                and MinHeap otherwise
         Returns:
             metrics (dict): dictionary containing the number of visited nodes, the number of
                 repetitions, the path and the distance of the shortest path from the source
                 to the target node in the graph
         """
-
-        distances = {
-            node: float("inf") for node in self.graph.keys()
-        }  # initialize the distance mapping
-        distances[source] = 0  # set the distance of the source node to 0
-        self.dijkstra_parents = (
+        stats = self._start_stats()  # counters of the search, None if disabled
+
+        if lazy:  # in lazy mode only the source node is known at the start
+            distances = {source: 0}  # initialize the distance mapping
+        else:
+            distances = {
+                node: float("inf") for node in self.graph.keys()
+            }  # initialize the distance mapping
+            distances[source] = 0  # set the distance of the source node to 0
+        parents = (
             {source: source} if viz == False else {source: None}
         )  # initialize the parent mapping
 
-        self.heap = []  # initialize the heap
-        self.push((0, source))  # (distance, node)
+        if queue is None and prefers_buckets(
+            self.integer_weight_bound(), len(self.graph)
+        ):  # small integer weights on a large graph
+            queue = "dial"  # bucket queue of Dial's algorithm
+        heap = self._new_heap(
+            stats, on_event, queue=queue
+        )  # initialize the heap of this query
+        heap.push((0, source))  # (distance, node)
 
         metrics = {
             "visited": 0,
@@ -203,13 +564,17 @@ class Graph(MinHeap):
             "distance": 0,
         }  # initialize the metrics
 
-        for node in self.graph.keys():  # add all nodes to the heap
-            if node != source:  # except the source node
-                self.push((float("inf"), node))  # push infinity [source, inf, inf inf]
+        if not lazy:  # in eager mode
+            for node in self.graph.keys():  # add all nodes to the heap
+                if node != source:  # except the source node
+                    heap.push(
+                        (float("inf"), node)
+                    )  # push infinity [source, inf, inf inf]
 
         visited = 0  # initialize the number of visited nodes
-        while self.heap:  # while the heap is not empty
-            distance, node = self.pop()  # pop the node with the smallest distance
+        relaxations = 0  # initialize the number of relaxed edges
+        while heap:  # while the heap is not empty
+            distance, node = heap.pop()  # pop the node with the smallest distance
             if node == target:  # if the current node is the target node
                 path = [target]  # initialize the path
                 visited += 1  # increment the number of visited nodes
@@ -218,32 +583,261 @@ class Graph(MinHeap):
                 ):  # while the last node in the path is not the source node
                     visited += 1  # increment the number of visited nodes
                     path.append(
-                        self.dijkstra_parents[path[-1]]
+                        parents[path[-1]]
                     )  # add the parent of the last node in the path to the path
                 path.reverse()  # reverse the path
                 metrics["visited"] = visited  # set the number of visited nodes
-                metrics["repetition"] = self.counter  # set the number of repetitions
+                metrics["repetition"] = heap.counter  # set the number of repetitions
                 metrics["path"] = path  # set the path
                 metrics["distance"] = distance  # set the distance
-                metrics[
-                    "predecessor"
-                ] = self.dijkstra_parents  # set the predecessor mapping
-                return metrics  # return the metrics
+                metrics["predecessor"] = parents  # set the predecessor mapping
+                return self._finish_stats(
+                    stats, metrics, relaxations
+                )  # return the metrics
 
             for neighbor, weight in self.graph[
                 node
             ]:  # for each neighbor of the current node
+                if neighbor in distances and not heap.contains(
+                    neighbor
+                ):  # if the neighbor is settled, its distance is final
+                    continue  # continue to the next neighbor
+                relaxations += 1  # increment the number of relaxed edges
                 new_distance = distance + weight  # calculate the new distance
-                if (
-                    new_distance < distances[neighbor]
+                if new_distance < distances.get(
+                    neighbor, float("inf")
+                ):  # if the new distance is smaller than the current distance
+                    distances[neighbor] = new_distance  # update the distance
+                    parents[neighbor] = node  # update the parent
+                    if heap.contains(neighbor):  # if the neighbor is in the heap
+                        heap.decrease_key(
+                            neighbor, new_distance
+                        )  # decrease the key of the neighbor
+                    else:  # if the neighbor is reached for the first time
+                        heap.push((new_distance, neighbor))  # push it to the heap
+
+        return self._finish_stats(stats, metrics, relaxations)  # return the metrics
+
+    def enable_stats(self, collector: StatsCollector = None) -> StatsCollector:
+        """Enables the statistics of the searches. Every dijkstra, a_star and bidirectional
+        search then returns a SearchStats object in metrics["stats"] (heap pushes and pops,
+        edge relaxations, decreases, settled nodes, peak frontier and wall time) and adds
+        it to the collector. A query answered by the query cache does no search, so the
+        collector only counts it in cache_hits. While disabled, the searches only count
+        the relaxed edges in a local variable.
+
+        Args:
+            collector (StatsCollector): collector of the totals, a new one by default
+        Returns:
+            collector (StatsCollector): the collector, also stored in self.stats_collector
+        """
+        self.stats_collector = collector or StatsCollector()
+        return self.stats_collector
+
+    def disable_stats(self):
+        """Disables the statistics of the searches.
+
+        Returns:
+            None
+        """
+        self.stats_collector = None
+
+    def _start_stats(self):
+        """Returns the counters of a new search, or None if statistics are disabled."""
+        if self.stats_collector is None:  # the only cost when disabled
+            return None
+        stats = SearchStats()  # counters of the search
+        stats.wall_time = time.perf_counter()  # start time, replaced by the duration
+        return stats
+
+    def _new_heap(self, stats, on_event=None, side: int = 0, queue=None) -> MinHeap:
+        """Returns the heap of a search, counting its operations if stats is given and
+        reporting them to on_event if a callback is given, see events.py. The queue
+        selects the backend, see queues.py."""
+        queue = get_queue(queue)  # MinHeap by default
+        if on_event is not None:  # stream the events of the search
+            return with_queue(EventMinHeap, queue)(
+                on_event, side, stats or SearchStats()
+            )
+        if stats is not None:  # count the operations of the search
+            return with_queue(CountingMinHeap, queue)(stats)
+        return queue()
+
+    def _finish_stats(self, stats, metrics, relaxations: int):
+        """Completes the counters of a search and adds them to the metrics.
+
+        Args:
+            stats (SearchStats): counters of the search, None if statistics are disabled
+            metrics (dict): metrics of the search
+            relaxations (int): number of edges the search tried to relax
+        Returns:
+            metrics (dict): the same metrics
+        """
+        if stats is None:  # statistics are disabled
+            return metrics
+        stats.wall_time = time.perf_counter() - stats.wall_time  # duration
+        stats.settled = stats.pops  # the heaps are indexed, every pop settles a node
+        stats.relaxations = relaxations
+        metrics["stats"] = stats  # return the counters with the metrics
+        collector = self.stats_collector
+        if collector is not None:  # add them to the totals
+            collector.add(stats)
+        return metrics
+
+    def enable_search_trees(
+        self, max_trees: int = 16, max_nodes: int = 1_000_000
+    ) -> SearchTreePool:
+        """Sets the bounds of the search trees kept by resumable_dijkstra. The least
+        recently used trees are evicted when there are more than max_trees trees or
+        when they have reached more than max_nodes nodes in total.
+
+        Args:
+            max_trees (int): largest number of search trees
+            max_nodes (int): largest total number of reached nodes
+        Returns:
+            search_trees (SearchTreePool): the pool, also stored in self.search_trees
+        """
+        self.search_trees = SearchTreePool(max_trees, max_nodes)  # empty pool
+        return self.search_trees
+
+    def resumable_dijkstra(
+        self, source: int, target: int, viz: bool = False
+    ) -> Tuple[List[int], int]:
+        """Performs lazy dijkstra search on the graph, keeping the search of every source
+        between queries. The search stops when the target is settled; a later query from
+        the same source is answered by a lookup if its target is already settled, and by
+        continuing the search otherwise. The searches are dropped when the graph changes.
+
+        Args:
+            source (int): id of the source node
+            target (int): id of the target node
+            viz (bool): whether to visualize the search
+        Returns:
+            metrics (dict): dictionary containing the number of visited nodes, the number of
+                repetitions, the path and the distance of the shortest path from the source
+                to the target node in the graph
+        """
+        if self.search_trees is None:  # use the default bounds
+            self.enable_search_trees()
+        return self.search_trees.query(self, source, target, viz)
+
+    def shortest_path_lengths(self, source: int) -> Dict[int, int]:
+        """Runs dijkstra search from the source without a target and returns the
+        distances to all reachable nodes. It is used by the preprocessing steps.
+
+        Args:
+            source (int): id of the source node
+        Returns:
+            distances (dict): dictionary mapping every reachable node to its distance
+        """
+        distances = {source: 0}  # initialize the distance mapping
+        settled = {}  # final distances
+        heap = MinHeap()  # initialize the heap
+        heap.push((0, source))  # (distance, node)
+        while heap.heap:  # while the heap is not empty
+            distance, node = heap.pop()  # pop the node with the smallest distance
+            settled[node] = distance  # its distance is final
+            for neighbor, weight in self.graph[
+                node
+            ]:  # for each neighbor of the current node
+                new_distance = distance + weight  # calculate the new distance
+                if new_distance < distances.get(
+                    neighbor, float("inf")
                 ):  # if the new distance is smaller than the current distance
                     distances[neighbor] = new_distance  # update the distance
-                    self.dijkstra_parents[neighbor] = node  # update the parent
-                    self.decrease_key(
-                        neighbor, new_distance
-                    )  # decrease the key of the neighbor
+                    if heap.contains(neighbor):  # if the neighbor is in the heap
+                        heap.decrease_key(neighbor, new_distance)  # decrease its key
+                    elif neighbor not in settled:  # if it is reached for the first time
+                        heap.push((new_distance, neighbor))  # push it to the heap
+        return settled  # return the distances
 
-        return metrics  # return the metrics
+    def _search_targets(self, source: int, targets) -> Tuple[Dict, Dict, int]:
+        """Runs lazy dijkstra search from the source until all the targets are settled.
+
+        Args:
+            source (int): id of the source node
+            targets (list): ids of the target nodes
+        Returns:
+            settled (dict): dictionary mapping every settled node to its distance
+            parents (dict): parent mapping of the search, the source is its own parent
+            repetition (int): number of heap comparisons, as in dijkstra
+        """
+        remaining = set(targets)  # targets that are not settled yet
+        distances = {source: 0}  # initialize the distance mapping
+        parents = {source: source}  # initialize the parent mapping
+        settled = {}  # final distances
+        heap = MinHeap()  # initialize the heap
+        heap.push((0, source))  # (distance, node)
+        while heap.heap and remaining:  # until all the targets are settled
+            distance, node = heap.pop()  # pop the node with the smallest distance
+            settled[node] = distance  # its distance is final
+            remaining.discard(node)  # it may be one of the targets
+            for neighbor, weight in self.graph[
+                node
+            ]:  # for each neighbor of the current node
+                new_distance = distance + weight  # calculate the new distance
+                if new_distance < distances.get(
+                    neighbor, float("inf")
+                ):  # if the new distance is smaller than the current distance
+                    distances[neighbor] = new_distance  # update the distance
+                    parents[neighbor] = node  # update the parent
+                    if heap.contains(neighbor):  # if the neighbor is in the heap
+                        heap.decrease_key(neighbor, new_distance)  # decrease its key
+                    else:  # if it is reached for the first time
+                        heap.push((new_distance, neighbor))  # push it to the heap
+        return settled, parents, heap.counter  # return the distances and the parents
+
+    def distance_matrix(self, sources: List[int], targets: List[int]) -> np.ndarray:
+        """Computes the shortest distances from every source to every target. It runs one
+        dijkstra search per distinct source, which stops as soon as all the targets are
+        settled, instead of one search per (source, target) pair.
+
+        Args:
+            sources (list): ids of the source nodes
+            targets (list): ids of the target nodes
+        Returns:
+            matrix (np.ndarray): float matrix of shape (len(sources), len(targets)), where
+                matrix[i, j] is the distance from sources[i] to targets[j], inf if unreachable
+        """
+        for node in targets:  # check the targets before searching
+            if node not in self.graph:  # if a target is not in the graph
+                raise KeyError(node)  # it would never be settled
+        matrix = np.full((len(sources), len(targets)), np.inf)  # initialize the matrix
+        rows = {}  # row of every source that has been searched
+        for i, source in enumerate(sources):  # for each source
+            if source in rows:  # if the source is repeated
+                matrix[i] = matrix[rows[source]]  # copy its row
+                continue
+            settled, _, _ = self._search_targets(source, targets)  # one search
+            matrix[i] = [
+                settled.get(node, np.inf) for node in targets
+            ]  # fill the row of the source
+            rows[source] = i  # remember the row
+        return matrix  # return the matrix
+
+    def preprocess_landmarks(self, k: int = 8, path: str = None):
+        """Prepares the "landmarks" heuristic of A* (ALT: A*, landmarks and triangle
+        inequality). It picks k landmarks and stores the exact distances from every
+        landmark to every node. If a path is given and the file was saved for this
+        graph with the same k, it is loaded instead; otherwise the result is saved to
+        the path.
+
+        Args:
+            k (int): number of landmarks
+            path (str): file where the preprocessing is cached
+        Returns:
+            landmarks (Landmarks): the preprocessing, also stored in self.landmarks
+        """
+        self.landmarks = None  # forget the previous preprocessing
+        if path is not None and os.path.exists(path):  # if there is a cached file
+            landmarks = Landmarks.load(path)  # load it
+            if landmarks.matches(self) and landmarks.k == k:
+                self.landmarks = landmarks  # use it if it belongs to this graph
+        if self.landmarks is None:  # if nothing was loaded
+            self.landmarks = Landmarks.build(self, k)  # run the preprocessing
+            if path is not None:  # and cache it
+                self.landmarks.save(path)
+        return self.landmarks  # return the preprocessing
 
     def h_func(self, node: int, target: int) -> int:
         """This heuristic function estimates the distance between
@@ -260,12 +854,20 @@ class Graph(MinHeap):
             target - node
         )  # return the absolute value of the difference between the indices
 
+    @_cached_query
     def a_star(
-        self, source: int, target: int, viz: bool = False
+        self,
+        source: int,
+        target: int,
+        viz: bool = False,
+        heuristic=None,
+        on_event=None,
+        queue=None,
     ) -> Tuple[List[int], int]:
         """Performs A* search on the graph. Returns the shortest path from the source.
-        It uses a list to keep track of the distances to the nodes. It iterates over the
-        nodes in the list and updates the distances to the neighbors of the current node.
+        It uses a min heap keyed on f = g + h to keep track of the nodes to expand, and the
+        heuristic value of every node is computed only once. It pops the node with the
+        smallest f value and updates the distances to the neighbors of the current node.
         Open set is a set of nodes that have been visited but whose neighbors haven't been
         completely explored. Closed set is a set of nodes that have been completely explored.
         Firstly, it checks if the current node is the target node. If it is, it returns the
@@ -278,20 +880,29 @@ class Graph(MinHeap):
             source (int): id of the source node
             target (int): id of the target node
             viz (bool): whether to visualize the search
+            heuristic (str or function): name of a registered heuristic ("index",
+                "manhattan", "euclidean", "octile", "zero", ...) or a function
+                (node, target) -> estimate. The default is h_func.
+            on_event (function): callback of the search events, as in dijkstra
+            queue (str or class): priority queue of the search, as in dijkstra; the
+                radix heap needs integer weights and a consistent heuristic
         Returns:
             metrics (dict): dictionary containing the number of visited nodes, the number of
                 repetitions, the path and the distance of the shortest path from the source
                 to the target node in the graph.
         """
-        distances = {
-            node: float("inf") for node in self.graph.keys()
-        }  # initialize the distance mapping
-        distances[source] = 0  # set the distance of the source node to 0
-        self.a_star_parents = (
+        stats = self._start_stats()  # counters of the search, None if disabled
+        h = get_heuristic(self, heuristic, target)  # heuristic of the query
+        distances = {source: 0}  # initialize the distance mapping
+        parents = (
             {source: source} if viz == False else {source: None}
         )  # initialize the parent mapping
+        h_values = {source: h(source)}  # cache of the heuristic values
 
-        open_set = set([source])  # initialize the open set with the source node
+        open_set = self._new_heap(
+            stats, on_event, queue=queue
+        )  # initialize the open set, a min heap of (f, node)
+        open_set.push((h_values[source], source))  # f = g + h of the source node
         closed_set = set()  # initialize the closed set
 
         metrics = {
@@ -302,10 +913,9 @@ class Graph(MinHeap):
         }  # initialize the metrics
         repetition = 0  # initialize the number of repetitions
         visited = 0  # initialize the number of visited nodes
+        relaxations = 0  # initialize the number of relaxed edges
         while open_set:  # while the open set is not empty
-            node = min(
-                open_set, key=lambda x: distances[x] + self.h_func(x, target)
-            )  # get the node with the smallest distance + heuristic value
+            _, node = open_set.pop()  # get the node with the smallest f value
 
             if node == target:  # if the current node is the target node
                 path = [target]  # initialize the path
@@ -314,7 +924,7 @@ class Graph(MinHeap):
                     path[-1] != source
                 ):  # while the last node in the path is not the source node
                     path.append(
-                        self.a_star_parents[path[-1]]
+                        parents[path[-1]]
                     )  # add the parent of the last node in the path to the path
                 path.reverse()  # reverse the path
 
@@ -322,12 +932,11 @@ class Graph(MinHeap):
                 metrics["visited"] = len(path)  # set the number of visited nodes
                 metrics["path"] = path  # set the path
                 metrics["distance"] = distances[target]  # set the distance
-                metrics[
-                    "predecessor"
-                ] = self.a_star_parents  # set the predecessor mapping
-                return metrics  # return the metrics
+                metrics["predecessor"] = parents  # set the predecessor mapping
+                return self._finish_stats(
+                    stats, metrics, relaxations
+                )  # return the metrics
 
-            open_set.remove(node)  # remove the current node from the open set
             closed_set.add(node)  # add the current node to the closed set
 
             for neighbor, weight in self.graph[
@@ -335,16 +944,190 @@ class Graph(MinHeap):
             ]:  # for each neighbor of the current node
                 if neighbor in closed_set:  # if the neighbor is in the closed set
                     continue  # continue to the next neighbor
+                relaxations += 1  # increment the number of relaxed edges
                 new_distance = distances[node] + weight  # calculate the new distance
 
-                if (
-                    new_distance < distances[neighbor]
+                if new_distance < distances.get(
+                    neighbor, float("inf")
                 ):  # if the new distance is smaller than the current distance
                     repetition += 1  # increment the number of repetitions
                     distances[neighbor] = new_distance  # update the distance
-                    self.a_star_parents[neighbor] = node  # update the parent
-                    open_set.add(neighbor)  # add the neighbor to the open set
-        return metrics  # return the metrics
+                    parents[neighbor] = node  # update the parent
+                    if neighbor not in h_values:  # compute the heuristic only once
+                        h_values[neighbor] = h(neighbor)
+                    f_value = new_distance + h_values[neighbor]  # f = g + h
+                    if open_set.contains(
+                        neighbor
+                    ):  # if the neighbor is in the open set
+                        open_set.decrease_key(neighbor, f_value)  # decrease its key
+                    else:  # otherwise
+                        open_set.push((f_value, neighbor))  # add it to the open set
+        return self._finish_stats(stats, metrics, relaxations)  # return the metrics
+
+    @_cached_query
+    def bidirectional_dijkstra(
+        self, source: int, target: int, viz: bool = False, on_event=None
+    ) -> Tuple[List[int], int]:
+        """Performs bidirectional dijkstra search on the graph. A forward search from the
+        source and a backward search from the target are grown at the same time, and the
+        search stops when the smallest keys of the two heaps add up to at least the length
+        of the best path found so far. Long queries settle about half as many nodes.
+
+        Args:
+            source (int): id of the source node
+            target (int): id of the target node
+            viz (bool): whether to visualize the search
+            on_event (function): callback of the search events, as in dijkstra; the
+                events of the backward search have side 1
+        Returns:
+            metrics (dict): dictionary containing the number of visited nodes, the number of
+                repetitions, the path and the distance of the shortest path from the source
+                to the target node in the graph
+        """
+        return self._bidirectional_search(
+            source, target, viz, lambda node: 0, on_event
+        )  # dijkstra is A* with a zero potential
+
+    @_cached_query
+    def bidirectional_a_star(
+        self,
+        source: int,
+        target: int,
+        viz: bool = False,
+        heuristic=None,
+        on_event=None,
+    ) -> Tuple[List[int], int]:
+        """Performs bidirectional A* search on the graph. Both searches use the average
+        potential p(node) = (h(node, target) - h(node, source)) / 2, which keeps the two
+        searches consistent with each other, so the stopping criterion of bidirectional
+        dijkstra stays correct. The heuristic must be consistent.
+
+        Args:
+            source (int): id of the source node
+            target (int): id of the target node
+            viz (bool): whether to visualize the search
+            heuristic (str or function): heuristic of the query, as in a_star
+            on_event (function): callback of the search events, as in
+                bidirectional_dijkstra
+        Returns:
+            metrics (dict): dictionary containing the number of visited nodes, the number of
+                repetitions, the path and the distance of the shortest path from the source
+                to the target node in the graph
+        """
+        h_target = get_heuristic(self, heuristic, target)  # estimate to the target
+        h_source = get_heuristic(self, heuristic, source)  # estimate to the source
+        potentials = {}  # cache of the potential values
+
+        def potential(node):
+            if node not in potentials:  # compute the potential only once
+                potentials[node] = (h_target(node) - h_source(node)) / 2
+            return potentials[node]
+
+        return self._bidirectional_search(source, target, viz, potential, on_event)
+
+    def _bidirectional_search(
+        self, source: int, target: int, viz: bool, potential, on_event=None
+    ):
+        """Runs the forward and backward searches of the bidirectional algorithms.
+        The forward heap is keyed on g + p and the backward heap on g - p, and the side
+        with the smaller heap is expanded at every step.
+
+        Args:
+            source (int): id of the source node
+            target (int): id of the target node
+            viz (bool): whether to visualize the search
+            potential (function): potential of a node, 0 for dijkstra
+            on_event (function): callback of the search events
+        Returns:
+            metrics (dict): dictionary containing the number of visited nodes, the number of
+                repetitions, the path and the distance of the shortest path
+        """
+        stats = self._start_stats()  # counters of the search, None if disabled
+        metrics = {
+            "visited": 0,
+            "repetition": 0,
+            "path": [],
+            "distance": 0,
+        }  # initialize the metrics
+
+        distances = ({source: 0}, {target: 0})  # forward and backward distances
+        parents = (
+            {source: source if viz == False else None},
+            {target: target},
+        )  # forward and backward parent mappings
+        heaps = (
+            self._new_heap(stats, on_event, 0),
+            self._new_heap(stats, on_event, 1),
+        )  # forward and backward heaps, sharing the counters
+        heaps[0].push((potential(source), source))  # forward key is g + p
+        heaps[1].push((-potential(target), target))  # backward key is g - p
+        settled = (set(), set())  # settled nodes of both searches
+        signs = (1, -1)  # sign of the potential in the keys of both searches
+
+        best = 0 if source == target else float("inf")  # length of the best path
+        meeting = source if source == target else None  # node where the searches meet
+        repetition = 0  # initialize the number of repetitions
+        relaxations = 0  # initialize the number of relaxed edges
+        while heaps[0].heap and heaps[1].heap:  # while both heaps are not empty
+            if (
+                heaps[0].heap[0][0] + heaps[1].heap[0][0] >= best
+            ):  # no better path can be found
+                break
+            side = (
+                0 if len(heaps[0].heap) <= len(heaps[1].heap) else 1
+            )  # expand the smaller frontier
+            other = 1 - side  # the other search
+            _, node = heaps[side].pop()  # pop the node with the smallest key
+            settled[side].add(node)  # settle the node
+            distance = distances[side][node]  # distance of the node
+
+            for neighbor, weight in self.graph[
+                node
+            ]:  # for each neighbor of the current node
+                if neighbor in settled[side]:  # if the neighbor is already settled
+                    continue  # continue to the next neighbor
+                relaxations += 1  # increment the number of relaxed edges
+                new_distance = distance + weight  # calculate the new distance
+                if new_distance < distances[side].get(
+                    neighbor, float("inf")
+                ):  # if the new distance is smaller than the current distance
+                    repetition += 1  # increment the number of repetitions
+                    distances[side][neighbor] = new_distance  # update the distance
+                    parents[side][neighbor] = node  # update the parent
+                    key = new_distance + signs[side] * potential(neighbor)
+                    if heaps[side].contains(neighbor):  # if the neighbor is in the heap
+                        heaps[side].decrease_key(neighbor, key)  # decrease its key
+                    else:  # otherwise
+                        heaps[side].push((key, neighbor))  # push it to the heap
+                if (
+                    neighbor in distances[other]
+                ):  # if the other search has reached the neighbor
+                    length = (
+                        distances[side][neighbor] + distances[other][neighbor]
+                    )  # length of the path through the neighbor
+                    if length < best:  # if it is shorter than the best path
+                        best, meeting = length, neighbor  # remember it
+
+        if meeting is None:  # if the searches did not meet
+            return self._finish_stats(stats, metrics, relaxations)  # return the metrics
+
+        path = [meeting]  # forward half of the path, from the meeting node
+        while path[-1] != source:  # until the source node is reached
+            path.append(parents[0][path[-1]])  # add the forward parent
+        path.reverse()  # reverse the forward half
+        while path[-1] != target:  # until the target node is reached
+            path.append(parents[1][path[-1]])  # add the backward parent
+
+        predecessor = parents[0]  # the forward parents lead back to the source
+        for previous, node in zip(path, path[1:]):  # along the backward half
+            predecessor[node] = previous  # point the nodes towards the source
+
+        metrics["visited"] = len(path)  # set the number of visited nodes
+        metrics["repetition"] = repetition  # set the number of repetitions
+        metrics["path"] = path  # set the path
+        metrics["distance"] = best  # set the distance
+        metrics["predecessor"] = predecessor  # set the predecessor mapping
+        return self._finish_stats(stats, metrics, relaxations)  # return the metrics
 
     def __str__(self):
         """Returns a string representation of the graph.
@@ -395,51 +1178,3 @@ if __name__ == "__main__":
     visualize_shortest_path(
         g, nodes, edges, 1, 4, "dijkstra"
     )  # visualize the shortest path
-
-### HEURISTIC FUNCTIONS THAT CAN BE USED ###
-## NOTE: The heuristic function must be consistent for A* to work properly ##
-## NOTE: This is different kind of heuristic functions that can be used, we implemented to test the default h_func ##
-# def h_func(self, node: int, target: int) -> int:
-#     """This heuristic function is similar to the Manhattan distance,
-#     but it allows for diagonal movement between nodes.
-#    It is not consistent, so it is not recommended to use it.
-#     Args:
-#        node (int): Node id
-#        target (int): Target node id
-#     Returns:
-#        int: The estimated distance between the two nodes
-#     """
-#     node_x, node_y = self.get_node_coordinates(node) # get the coordinates of the node
-#     target_x, target_y = self.get_node_coordinates(target) # get the coordinates of the target node
-#     dx = abs(node_x - target_x) # calculate the difference in x coordinates
-#     dy = abs(node_y - target_y) # calculate the difference in y coordinates
-#     return max(dx, dy) + (np.sqrt(2) - 1) * min(dx, dy) # return the estimated distance
-
-# def h_func(self, node: int, target: int) -> int:
-#     """Manhattan distance: This heuristic function calculates
-#     the distance between two nodes as the sum of the absolute
-#     differences of their coordinates.
-#     Args:
-#         node (int): Node id
-#         target (int): Target node id
-#     Returns:
-#         int: The estimated distance between the two nodes
-#     """
-#     node_x, node_y = self.get_node_coordinates(node) # get the coordinates of the node
-#     target_x, target_y = self.get_node_coordinates(target) # get the coordinates of the target node
-#     return abs(node_x - target_x) + abs(node_y - target_y) # return the estimated distance
-
-# def h_func(self, node: int, target: int) -> float:
-#     """Calculate the Euclidean distance between two nodes.
-#     Args:
-#         node (int): The first node.
-#         target (int): The second node.
-
-#     Returns:
-#         float: The Euclidean distance between the two nodes.
-#     """
-#     node_x, node_y = self.get_node_coordinates(node) # get the coordinates of the node
-#     target_x, target_y = self.get_node_coordinates(target) # get the coordinates of the target node
-#     dx = node_x - target_x # calculate the difference in x coordinates
-#     dy = node_y - target_y # calculate the difference in y coordinates
-#     return sqrt(dx**2 + dy**2) # return the estimated distance
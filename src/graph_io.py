@@ -0,0 +1,221 @@
+"""
+@description: This file contains the functions that write graphs to a binary file and read them back, either as a memory-mapped CSRGraph or as a Graph.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import json
+import mmap
+import sys
+from array import array
+import numpy as np
+
+# Import modules
+from graph import Graph
+from csr_graph import CSRGraph, _typecode, first_id
+
+MAGIC = b"CSRG"  # First bytes of a graph file
+VERSION = 1  # Version of the format written by save_graph
+ALIGNMENT = 8  # Every section starts at a multiple of 8 bytes
+SECTIONS = ("node_ids", "offsets", "neighbors", "weights", "xs", "ys")
+
+## NOTE: File format ##
+# MAGIC, then the version and the length of the header as 4-byte little-endian integers,
+# then a JSON header, then the sections. The header gives the byte order of the machine
+# that wrote the file, the first node id if the node ids are contiguous and, for every
+# section, its typecode, its number of elements and its offset from the start of the
+# data, which is the first multiple of 8 after the header. The sections are the CSR
+# buffers of the graph (see CSRGraph), whose rows are sorted by neighbor. If the
+# adjacency lists of the saved Graph were not sorted, an "order" section stores the
+# position of every entry in its original list, so load_graph(path, frozen=False)
+# rebuilds the lists in the same order.
+
+
+def _pad(position: int) -> int:
+    """Returns the number of bytes that align the position to ALIGNMENT."""
+    return -position % ALIGNMENT
+
+
+def _pack(g: Graph):
+    """
+    This function packs the adjacency lists of a Graph into sorted CSR buffers and
+    records the original position of every entry.
+
+    Args:
+        g (Graph): Graph object
+
+    Returns:
+        buffers (dict): The buffers of SECTIONS, and "order" if a list was not sorted
+    """
+    node_ids = array("q", g.graph.keys())  # One row per node
+    offsets = array("q", [0])  # Start of the first row
+    neighbors = array("q")  # Neighbors of all rows
+    order = array("q")  # Original positions of the entries
+    weight_values = []  # Weights of all rows
+    sorted_rows = True  # Whether every list was sorted already
+    for node in node_ids:
+        row = g.graph[node]
+        positions = sorted(range(len(row)), key=lambda k: row[k][0])  # Stable sort
+        for k, position in enumerate(positions):
+            neighbors.append(row[position][0])
+            weight_values.append(row[position][1])
+            order.append(position)
+            sorted_rows = sorted_rows and k == position
+        offsets.append(len(neighbors))  # End of the row
+    x_values = [g.node_coordinates[node][0] for node in node_ids]
+    y_values = [g.node_coordinates[node][1] for node in node_ids]
+    buffers = {
+        "node_ids": node_ids,
+        "offsets": offsets,
+        "neighbors": neighbors,
+        "weights": array(_typecode(weight_values), weight_values),
+        "xs": array(_typecode(x_values), x_values),
+        "ys": array(_typecode(y_values), y_values),
+    }
+    if not sorted_rows:  # The order is needed to rebuild the lists
+        buffers["order"] = order
+    return buffers
+
+
+def save_graph(g: Graph, path: str):
+    """
+    This function writes a graph to a binary file. A CSRGraph is written as it is, and a
+    Graph is packed first.
+
+    Args:
+        g (Graph or CSRGraph): Graph object
+        path (str): Path of the file
+
+    Returns:
+        None
+    """
+    if isinstance(g, CSRGraph):  # The buffers are ready
+        buffers = {name: getattr(g, name) for name in SECTIONS}
+    else:
+        buffers = _pack(g)
+    views = {name: memoryview(buffer) for name, buffer in buffers.items()}
+
+    sections, position = {}, 0  # Typecode, offset and length of every section
+    for name, view in views.items():
+        sections[name] = [view.format, position, len(view)]
+        position += view.nbytes + _pad(view.nbytes)
+    header = json.dumps(
+        {
+            "version": VERSION,
+            "byteorder": sys.byteorder,
+            "nodes": len(views["node_ids"]),
+            "entries": len(views["neighbors"]),
+            "first_id": first_id(buffers["node_ids"]),
+            "sections": sections,
+        }
+    ).encode()  # Header of the file
+
+    with open(path, "wb") as file:
+        file.write(MAGIC)  # Magic bytes
+        file.write(VERSION.to_bytes(4, "little"))  # Version of the format
+        file.write(len(header).to_bytes(4, "little"))  # Length of the header
+        file.write(header)  # Header
+        file.write(b"\0" * _pad(file.tell()))  # Align the data
+        for view in views.values():  # Sections
+            file.write(view.cast("B"))
+            file.write(b"\0" * _pad(view.nbytes))
+
+
+def _read_header(file):
+    """
+    This function reads and checks the header of a graph file.
+
+    Args:
+        file (file): File opened in binary mode
+
+    Returns:
+        header (dict): The header
+        start (int): Offset of the data from the start of the file
+    """
+    if file.read(len(MAGIC)) != MAGIC:  # Check the magic bytes
+        raise ValueError(f"{file.name} is not a graph file")
+    version = int.from_bytes(file.read(4), "little")
+    if version > VERSION:  # Written by a newer version of the program
+        raise ValueError(
+            f"{file.name} has format version {version}, expected {VERSION}"
+        )
+    length = int.from_bytes(file.read(4), "little")  # Length of the header
+    header = json.loads(file.read(length))
+    return header, file.tell() + _pad(file.tell())
+
+
+def load_graph(path: str, frozen: bool = True):
+    """
+    This function reads a graph written by save_graph. A frozen graph is a CSRGraph whose
+    buffers are memoryviews of the memory-mapped file: nothing is copied, so even a very
+    large graph opens at once, its pages are read from the disk only when a search needs
+    them, and processes that open the same file share them in the page cache. When the
+    node ids are contiguous, the row of a node is computed from its id; otherwise the
+    index dictionary of CSRGraph is built, which reads all the node ids.
+    Otherwise a Graph is built with the same adjacency lists as the saved one.
+
+    Args:
+        path (str): Path of the file
+        frozen (bool): Whether to return a memory-mapped CSRGraph instead of a Graph
+
+    Returns:
+        g (CSRGraph or Graph): The graph
+    """
+    with open(path, "rb") as file:
+        header, start = _read_header(file)
+        data = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    buffers = {}
+    for name, (typecode, offset, count) in header["sections"].items():
+        offset += start  # Offset from the start of the file
+        size = array(typecode).itemsize * count  # Number of bytes of the section
+        buffers[name] = data[offset : offset + size].cast(typecode)
+    if header["byteorder"] != sys.byteorder:  # Written on another machine
+        for name, buffer in buffers.items():  # Copy and convert the sections
+            buffers[name] = array(buffer.format, buffer.tobytes())
+            buffers[name].byteswap()
+
+    if not frozen:
+        csr = CSRGraph(*(buffers[name] for name in SECTIONS))
+        return thaw(csr, buffers.get("order"))
+    return CSRGraph.from_buffers(
+        *(buffers[name] for name in SECTIONS), first=header.get("first_id")
+    )  # The rows are computed from the ids if they are contiguous
+
+
+def thaw(csr: CSRGraph, order=None) -> Graph:
+    """
+    This function copies a CSRGraph into a Graph that can be modified.
+
+    Args:
+        csr (CSRGraph): Frozen graph
+        order (array): Original positions of the entries in their lists, see save_graph
+
+    Returns:
+        g (Graph): The graph
+    """
+    g = Graph()
+    node_ids = csr.node_ids.tolist()
+    g.add_nodes_from(node_ids, csr.xs.tolist(), csr.ys.tolist())
+    offsets, neighbors = csr.offsets.tolist(), csr.neighbors.tolist()
+    weights = csr.weights.tolist()
+    positions = order.tolist() if order is not None else None
+    for i, node in enumerate(node_ids):  # Rebuild the adjacency lists
+        start, end = offsets[i], offsets[i + 1]
+        row = list(zip(neighbors[start:end], weights[start:end]))
+        if positions is not None:  # Restore the original order
+            original = [None] * len(row)
+            for position, entry in zip(positions[start:end], row):
+                original[position] = entry
+            row = original
+        g.graph[node] = row
+    edge_weights = g.edge_weights  # Index the edges, the first edge is kept
+    for node in node_ids:
+        for neighbor, weight in g.graph[node]:
+            edge_weights.setdefault((node, neighbor), weight)
+    g._track_weights(weights)  # Bound of the weights
+    g._changed()  # The edges were added directly
+    return g
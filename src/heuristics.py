@@ -0,0 +1,125 @@
+"""
+@description: This file contains the heuristic functions of the A* algorithm and the registry used to select them.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+from math import sqrt
+
+## NOTE: The heuristic function must be consistent for A* to work properly ##
+# A heuristic is registered as a factory. The factory is called once per query with
+# the graph and the target node, and returns a function h(node) that estimates the
+# distance from the node to the target. Everything that depends only on the target
+# is computed by the factory, so h itself is as cheap as possible.
+HEURISTICS = {}  # Heuristic factories by name
+
+
+def register_heuristic(name: str, factory=None):
+    """
+    This function registers a heuristic under the given name, so it can be selected
+    per query with a_star(..., heuristic=name). Without a factory, it returns a
+    decorator that registers the decorated function.
+
+    Args:
+        name (str): Name of the heuristic
+        factory (function): Function (graph, target) -> h, where h(node) is the estimate
+
+    Returns:
+        factory (function): The same factory, or a decorator if no factory is given
+    """
+    if factory is None:  # Used as a decorator
+        return lambda factory: register_heuristic(name, factory)
+    HEURISTICS[name] = factory  # Add the factory to the registry
+    return factory
+
+
+def get_heuristic(graph, heuristic, target: int):
+    """
+    This function returns the heuristic function h(node) of a query.
+
+    Args:
+        graph (Graph): Graph object
+        heuristic (str or function): Name of a registered heuristic, a function
+            (node, target) -> estimate, or None for the default heuristic of the graph
+        target (int): Target node
+
+    Returns:
+        h (function): Function node -> estimated distance to the target
+    """
+    if heuristic is None:  # Use the default heuristic of the graph
+        heuristic = "index"
+    if callable(heuristic):  # Use the given function
+        return lambda node: heuristic(node, target)
+    if heuristic not in HEURISTICS:  # Check the name
+        raise ValueError(
+            f"Unknown heuristic {heuristic!r}, expected one of {sorted(HEURISTICS)}"
+        )
+    return HEURISTICS[heuristic](graph, target)  # Build the heuristic of the query
+
+
+@register_heuristic("index")
+def index_heuristic(graph, target: int):
+    """The absolute value of the difference between the ids of the nodes (Graph.h_func)."""
+    h_func = graph.h_func  # Bound method, so subclasses can override it
+    return lambda node: h_func(node, target)
+
+
+@register_heuristic("zero")
+def zero_heuristic(graph, target: int):
+    """No estimate at all, A* behaves like dijkstra's algorithm."""
+    return lambda node: 0
+
+
+@register_heuristic("manhattan")
+def manhattan_heuristic(graph, target: int):
+    """Manhattan distance: the sum of the absolute differences of the coordinates."""
+    index, xs, ys = graph.coordinate_arrays()  # Coordinates of all nodes
+    target_x, target_y = xs[index[target]], ys[index[target]]  # Target coordinates
+
+    def h(node):
+        i = index[node]  # Row of the node
+        return abs(xs[i] - target_x) + abs(ys[i] - target_y)
+
+    return h
+
+
+@register_heuristic("euclidean")
+def euclidean_heuristic(graph, target: int):
+    """Euclidean distance: the length of the straight line between the nodes."""
+    index, xs, ys = graph.coordinate_arrays()  # Coordinates of all nodes
+    target_x, target_y = xs[index[target]], ys[index[target]]  # Target coordinates
+
+    def h(node):
+        i = index[node]  # Row of the node
+        dx, dy = xs[i] - target_x, ys[i] - target_y  # Differences of the coordinates
+        return sqrt(dx * dx + dy * dy)
+
+    return h
+
+
+@register_heuristic("octile")
+def octile_heuristic(graph, target: int):
+    """Octile distance: like the Manhattan distance, but diagonal moves are allowed."""
+    index, xs, ys = graph.coordinate_arrays()  # Coordinates of all nodes
+    target_x, target_y = xs[index[target]], ys[index[target]]  # Target coordinates
+    diagonal = sqrt(2) - 1  # Extra cost of a diagonal move
+
+    def h(node):
+        i = index[node]  # Row of the node
+        dx, dy = abs(xs[i] - target_x), abs(ys[i] - target_y)
+        return max(dx, dy) + diagonal * min(dx, dy)
+
+    return h
+
+
+@register_heuristic("landmarks")
+def landmark_heuristic(graph, target: int):
+    """ALT heuristic: the best triangle inequality bound over the landmarks of the graph."""
+    if graph.landmarks is None:  # The preprocessing is needed
+        raise ValueError(
+            'The "landmarks" heuristic needs graph.preprocess_landmarks() first'
+        )
+    return graph.landmarks.heuristic(target)
@@ -0,0 +1,471 @@
+"""
+@description: This file contains streaming importers for external graph files: DIMACS .gr/.co files and CSV edge lists, optionally compressed. They read the files in chunks, so the text of a file is never held in memory.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import argparse
+import bz2
+import csv
+import gzip
+import io
+import lzma
+import os
+import sys
+import time
+from array import array
+from contextlib import contextmanager
+from itertools import chain, islice
+import numpy as np
+
+# Import modules
+from graph import Graph
+from csr_graph import CSRGraph, _typecode
+from graph_io import save_graph
+
+OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+    ".lzma": lzma.open,
+}  # Decompressors by file extension
+
+## NOTE: Memory ##
+# The files are read line by line and parsed into chunks of chunk_size rows. Every chunk
+# is inserted with one add_nodes_from or add_edges_from call and dropped before the next
+# one is read, so no list of all the edges is ever built. A frozen import appends the
+# chunks to typed arrays instead, 8 bytes per value, and packs them into a CSRGraph at
+# the end. Only its reading is done in chunks: CSRGraph.from_edges sorts copies of all
+# the edges in both directions, so the peak memory grows with the number of edges and
+# is several times the size of the final CSRGraph, though still far below the
+# adjacency lists of a Graph with the same edges.
+# The edges of the graphs are undirected. A DIMACS file lists every road in both
+# directions, so with symmetric=True only the arc (u, v) with u <= v is kept.
+
+
+@contextmanager
+def open_text(path: str):
+    """
+    This function opens a text file for reading, decompressing it if its extension is
+    one of OPENERS.
+
+    Args:
+        path (str): Path of the file
+
+    Yields:
+        file (file): The text of the file
+        raw (file): The file on the disk, raw.tell() is the number of bytes read
+    """
+    with open(path, "rb") as raw:
+        opener = OPENERS.get(os.path.splitext(path)[1].lower())
+        if opener is None:  # Not compressed
+            file = io.TextIOWrapper(raw, encoding="utf-8")
+        else:
+            file = opener(raw, "rt", encoding="utf-8")
+        try:
+            yield file, raw
+        finally:
+            file.close()
+
+
+def _number(text: str):
+    """Parses an integer, or a float if the text is not an integer."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _chunks(rows, chunk_size: int):
+    """
+    This function groups rows into chunks and transposes every chunk into columns.
+
+    Args:
+        rows (iterator): Tuples of the same length
+        chunk_size (int): Number of rows per chunk
+
+    Yields:
+        columns (tuple): One tuple per column of the chunk
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:  # No more rows
+            return
+        yield tuple(zip(*chunk))
+
+
+def dimacs_nodes(file):
+    """
+    This function reads the nodes of a DIMACS coordinate file (.co), the "v id x y" lines.
+
+    Args:
+        file (file): Text of the file
+
+    Yields:
+        node (tuple): (node, x, y)
+    """
+    for line in file:
+        if line.startswith("v"):
+            _, node, x, y = line.split()
+            yield int(node), _number(x), _number(y)
+
+
+def dimacs_arcs(file, symmetric: bool = True):
+    """
+    This function reads the arcs of a DIMACS graph file (.gr), the "a u v w" lines.
+
+    Args:
+        file (file): Text of the file
+        symmetric (bool): Whether every arc is listed in both directions, then only
+            the arcs (u, v) with u <= v are kept
+
+    Yields:
+        edge (tuple): (node1, node2, weight)
+    """
+    for line in file:
+        if line.startswith("a"):
+            _, node1, node2, weight = line.split()
+            node1, node2 = int(node1), int(node2)
+            if symmetric and node1 > node2:  # The other direction is kept
+                continue
+            yield node1, node2, _number(weight)
+
+
+def dimacs_size(path: str):
+    """
+    This function reads the "p sp N M" line of a DIMACS graph file.
+
+    Args:
+        path (str): Path of the .gr file
+
+    Returns:
+        nodes (int): Number of nodes
+        arcs (int): Number of arcs
+    """
+    with open_text(path) as (file, _):
+        for line in file:
+            if line.startswith("p"):
+                _, _, nodes, arcs = line.split()
+                return int(nodes), int(arcs)
+    raise ValueError(f'{path} has no "p sp" line')
+
+
+def csv_rows(file, columns=(0, 1, 2), delimiter: str = ","):
+    """
+    This function reads rows of numbers from a CSV file. A first row that is not
+    numeric is taken as the header and skipped.
+
+    Args:
+        file (file): Text of the file
+        columns (tuple): Positions of the columns to read
+        delimiter (str): Delimiter of the columns
+
+    Yields:
+        row (tuple): The numbers of the columns
+    """
+    for line, row in enumerate(csv.reader(file, delimiter=delimiter), start=1):
+        if not row:  # Empty line
+            continue
+        try:
+            yield tuple(_number(row[column]) for column in columns)
+        except (ValueError, IndexError):
+            if line == 1:  # Header
+                continue
+            raise ValueError(f"Line {line} is not a row of numbers: {row}")
+
+
+class _Progress:
+    """
+    This class measures the throughput of an import and prints it.
+
+    @attributes:
+        nodes (int): Number of nodes read.
+        edges (int): Number of edges read.
+        bytes (int): Number of bytes read from the disk in the finished files.
+        raw (file): File being read, its position is added to the bytes.
+        start (float): Start time of the import.
+        log (file): Where to print the progress, None for no output.
+    """
+
+    def __init__(self, log=None):
+        self.nodes = 0
+        self.edges = 0
+        self.bytes = 0
+        self.raw = None
+        self.start = time.perf_counter()
+        self.log = log
+
+    def read(self) -> int:
+        """Returns the number of bytes read from the disk."""
+        return self.bytes + (self.raw.tell() if self.raw is not None else 0)
+
+    def update(self):
+        """Prints the progress."""
+        if self.log is not None:
+            seconds = time.perf_counter() - self.start
+            print(
+                f"{self.nodes:>12,} nodes {self.edges:>12,} edges "
+                f"{self.read() / 1e6:10.1f} MB {self.edges / seconds:12,.0f} edges/s",
+                file=self.log,
+                flush=True,
+            )
+
+    def report(self) -> dict:
+        """
+        This function returns the throughput of the import.
+
+        Returns:
+            report (dict): nodes, edges, bytes, seconds, edges_per_second and
+                megabytes_per_second
+        """
+        seconds = time.perf_counter() - self.start
+        return {
+            "nodes": self.nodes,
+            "edges": self.edges,
+            "bytes": self.read(),
+            "seconds": seconds,
+            "edges_per_second": self.edges / seconds if seconds else 0.0,
+            "megabytes_per_second": self.read() / 1e6 / seconds if seconds else 0.0,
+        }
+
+
+def _insert(g: Graph, node_chunks, edge_chunks, progress: _Progress) -> Graph:
+    """
+    This function adds the chunks to a Graph. The endpoints of the edges that are not
+    in the graph yet are added with the coordinates (0, 0).
+
+    Args:
+        g (Graph): Graph object
+        node_chunks (iterator): (nodes, xs, ys) columns
+        edge_chunks (iterator): (sources, targets, weights) columns
+        progress (_Progress): Progress of the import
+
+    Returns:
+        g (Graph): The same graph
+    """
+    for nodes, xs, ys in node_chunks:
+        g.add_nodes_from(nodes, xs, ys)
+        progress.nodes += len(nodes)
+        progress.update()
+    graph = g.graph
+    for sources, targets, weights in edge_chunks:
+        missing = [
+            node for node in dict.fromkeys(chain(sources, targets)) if node not in graph
+        ]  # Nodes without coordinates
+        if missing:
+            g.add_nodes_from(missing, [0] * len(missing), [0] * len(missing))
+            progress.nodes += len(missing)
+        g.add_edges_from(sources, targets, weights)
+        progress.edges += len(sources)
+        progress.update()
+    return g
+
+
+def _extend(buffer: array, values) -> array:
+    """Appends the values to an array, switching it to doubles for a float value."""
+    if buffer.typecode == "q" and _typecode(values) == "d":  # Not integers anymore
+        buffer = array("d", buffer)
+    buffer.extend(values)
+    return buffer
+
+
+def _pack(node_chunks, edge_chunks, progress: _Progress) -> CSRGraph:
+    """
+    This function packs the chunks into a CSRGraph. The endpoints of the edges that
+    are not in the nodes are added with the coordinates (0, 0). All the edges are kept
+    in arrays until the end, so the memory grows with the size of the files.
+
+    Args:
+        node_chunks (iterator): (nodes, xs, ys) columns
+        edge_chunks (iterator): (sources, targets, weights) columns
+        progress (_Progress): Progress of the import
+
+    Returns:
+        csr (CSRGraph): The frozen graph
+    """
+    nodes, xs, ys = array("q"), array("q"), array("q")
+    for chunk_nodes, chunk_xs, chunk_ys in node_chunks:
+        nodes.extend(chunk_nodes)
+        xs, ys = _extend(xs, chunk_xs), _extend(ys, chunk_ys)
+        progress.nodes += len(chunk_nodes)
+        progress.update()
+    sources, targets, weights = array("q"), array("q"), array("q")
+    for chunk_sources, chunk_targets, chunk_weights in edge_chunks:
+        sources.extend(chunk_sources)
+        targets.extend(chunk_targets)
+        weights = _extend(weights, chunk_weights)
+        progress.edges += len(chunk_sources)
+        progress.update()
+
+    nodes = np.frombuffer(nodes, dtype=np.int64)  # Views of the arrays
+    xs = np.frombuffer(xs, dtype=np.int64 if xs.typecode == "q" else np.float64)
+    ys = np.frombuffer(ys, dtype=np.int64 if ys.typecode == "q" else np.float64)
+    sources = np.frombuffer(sources, dtype=np.int64)
+    targets = np.frombuffer(targets, dtype=np.int64)
+    weights = np.frombuffer(
+        weights, dtype=np.int64 if weights.typecode == "q" else np.float64
+    )
+    missing = np.setdiff1d(np.concatenate((sources, targets)), nodes)  # Unknown nodes
+    if len(missing):
+        nodes = np.concatenate((nodes, missing))
+        xs = np.concatenate((xs, np.zeros(len(missing), dtype=xs.dtype)))
+        ys = np.concatenate((ys, np.zeros(len(missing), dtype=ys.dtype)))
+        progress.nodes += len(missing)
+    return CSRGraph.from_edges(nodes, xs, ys, sources, targets, weights)
+
+
+def _load(node_files, edge_files, g, frozen: bool, chunk_size: int, log, nodes=()):
+    """
+    This function streams the nodes, then the edges, into a Graph or a CSRGraph.
+
+    Args:
+        node_files (list): (path, function that parses the text into node rows)
+        edge_files (list): (path, function that parses the text into edge rows)
+        g (Graph): Graph to add to, a new one by default
+        frozen (bool): Whether to return a CSRGraph
+        chunk_size (int): Number of rows inserted at once
+        log (file): Where to print the progress, None for no output
+        nodes (iterator): (node, x, y) rows added before the node files
+
+    Returns:
+        g (Graph or CSRGraph): The graph
+        report (dict): Throughput of the import, see _Progress.report
+    """
+    progress = _Progress(log)
+
+    def stream(files):
+        for path, parse in files:
+            with open_text(path) as (file, raw):
+                progress.raw = raw
+                yield from _chunks(parse(file), chunk_size)
+                progress.bytes += raw.tell()
+                progress.raw = None
+
+    node_chunks = chain(_chunks(nodes, chunk_size), stream(node_files))
+    if frozen:
+        if g is not None:
+            raise ValueError("A frozen import cannot add to an existing graph")
+        g = _pack(node_chunks, stream(edge_files), progress)
+    else:
+        g = _insert(
+            Graph() if g is None else g, node_chunks, stream(edge_files), progress
+        )
+    return g, progress.report()
+
+
+def read_dimacs(
+    gr_path: str,
+    co_path: str = None,
+    g: Graph = None,
+    frozen: bool = False,
+    symmetric: bool = True,
+    chunk_size: int = 100_000,
+    log=None,
+):
+    """
+    This function imports a DIMACS shortest path graph, like the road networks of the
+    9th DIMACS challenge. Without a coordinate file, the nodes 1 to N of the "p sp"
+    line get the coordinates (0, 0), and only the zero heuristic is admissible.
+
+    Args:
+        gr_path (str): Path of the .gr file, may be compressed
+        co_path (str): Path of the .co file, may be compressed
+        g (Graph): Graph to add to, a new one by default
+        frozen (bool): Whether to return a CSRGraph
+        symmetric (bool): Whether every arc is listed in both directions
+        chunk_size (int): Number of rows inserted at once
+        log (file): Where to print the progress, None for no output
+
+    Returns:
+        g (Graph or CSRGraph): The graph
+        report (dict): Throughput of the import
+    """
+    node_files, nodes = [], ()
+    if co_path is not None:
+        node_files.append((co_path, dimacs_nodes))
+    else:  # Nodes of the "p sp" line
+        N, _ = dimacs_size(gr_path)
+        nodes = ((node, 0, 0) for node in range(1, N + 1))
+    edge_files = [(gr_path, lambda file: dimacs_arcs(file, symmetric))]
+    return _load(node_files, edge_files, g, frozen, chunk_size, log, nodes)
+
+
+def read_csv(
+    edges_path: str,
+    nodes_path: str = None,
+    g: Graph = None,
+    frozen: bool = False,
+    delimiter: str = ",",
+    edge_columns=(0, 1, 2),
+    node_columns=(0, 1, 2),
+    chunk_size: int = 100_000,
+    log=None,
+):
+    """
+    This function imports a graph from a CSV edge list and an optional CSV node list.
+    Nodes that are only in the edge list get the coordinates (0, 0).
+
+    Args:
+        edges_path (str): Path of the edges, source,target,weight rows, may be compressed
+        nodes_path (str): Path of the nodes, node,x,y rows, may be compressed
+        g (Graph): Graph to add to, a new one by default
+        frozen (bool): Whether to return a CSRGraph
+        delimiter (str): Delimiter of the columns
+        edge_columns (tuple): Positions of the source, target and weight columns
+        node_columns (tuple): Positions of the node, x and y columns
+        chunk_size (int): Number of rows inserted at once
+        log (file): Where to print the progress, None for no output
+
+    Returns:
+        g (Graph or CSRGraph): The graph
+        report (dict): Throughput of the import
+    """
+    node_files = []
+    if nodes_path is not None:
+        node_files.append(
+            (nodes_path, lambda file: csv_rows(file, node_columns, delimiter))
+        )
+    edge_files = [(edges_path, lambda file: csv_rows(file, edge_columns, delimiter))]
+    return _load(node_files, edge_files, g, frozen, chunk_size, log)
+
+
+""" python importers.py USA-road-d.NY.gr.gz --co USA-road-d.NY.co.gz --save ny.csrg """
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a DIMACS or CSV graph")
+    parser.add_argument("edges", help=".gr file or CSV edge list, may be compressed")
+    parser.add_argument("--co", help="DIMACS .co coordinate file")
+    parser.add_argument("--nodes", help="CSV node list")
+    parser.add_argument("--delimiter", default=",", help="delimiter of the CSV files")
+    parser.add_argument(
+        "--chunk-size", type=int, default=100_000, help="rows per insert"
+    )
+    parser.add_argument("--save", help="save the graph with graph_io.save_graph")
+    args = parser.parse_args()  # Parse the arguments
+
+    name = args.edges.lower()
+    for extension in OPENERS:  # Drop the compression extension
+        name = name.removesuffix(extension)
+    if name.endswith(".gr"):
+        g, report = read_dimacs(
+            args.edges, args.co, frozen=True, chunk_size=args.chunk_size, log=sys.stdout
+        )
+    else:
+        g, report = read_csv(
+            args.edges,
+            args.nodes,
+            frozen=True,
+            delimiter=args.delimiter,
+            chunk_size=args.chunk_size,
+            log=sys.stdout,
+        )
+    print(
+        f"{report['nodes']:,} nodes and {report['edges']:,} edges in "
+        f"{report['seconds']:.1f} s: {report['edges_per_second']:,.0f} edges/s, "
+        f"{report['megabytes_per_second']:.1f} MB/s"
+    )
+    if args.save:
+        save_graph(g, args.save)
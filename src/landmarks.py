@@ -0,0 +1,196 @@
+"""
+@description: This file contains the Landmarks class. It is the preprocessing of the ALT heuristic of the A* algorithm.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import json
+import sys
+import zlib
+from array import array
+
+MAGIC = b"ALT1"  # First bytes of a landmarks file
+
+
+def graph_fingerprint(g) -> int:
+    """
+    This function computes a checksum of the nodes and edges of the graph. It is stored
+    with the preprocessing, so a file is never used with another version of the graph.
+
+    Args:
+        g (Graph): Graph object
+
+    Returns:
+        fingerprint (int): CRC32 of the nodes, edges and weights
+    """
+    fingerprint = zlib.crc32(array("q", g.graph.keys()).tobytes())  # The nodes
+    chunk = array("d")  # Edges are hashed in chunks to bound the memory
+    for node, neighbor, weight in g.iter_edges():  # Iterate over the edges
+        chunk.extend((node, neighbor, weight))  # Add the edge to the chunk
+        if len(chunk) >= 3 * 65536:  # If the chunk is full
+            fingerprint = zlib.crc32(chunk.tobytes(), fingerprint)  # hash it
+            del chunk[:]  # and empty it
+    return zlib.crc32(chunk.tobytes(), fingerprint)  # Hash the last chunk
+
+
+class Landmarks:
+    """
+    This class stores the exact distances from a few landmark nodes to every node.
+    By the triangle inequality, |d(L, target) - d(L, node)| is a lower bound of the
+    distance between node and target for every landmark L, so the largest of these
+    bounds is a consistent heuristic that takes the edge weights into account.
+
+    @attributes:
+        landmarks (list): The landmark nodes.
+        node_ids (array): The nodes, in the order of the distance arrays.
+        index (dict): A dictionary mapping nodes to their positions in the arrays.
+        distances (list): One array of distances per landmark, inf if unreachable.
+        fingerprint (int): Checksum of the graph the distances were computed on.
+        k (int): Number of landmarks requested, more than len(landmarks) if every
+            reachable node became a landmark before k were picked.
+    """
+
+    def __init__(self, landmarks, node_ids, distances, fingerprint, k):
+        self.landmarks = landmarks
+        self.k = k
+        self.node_ids = node_ids
+        self.index = {node: i for i, node in enumerate(node_ids)}
+        self.distances = distances
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, g, k: int = 8) -> "Landmarks":
+        """
+        This function picks k landmarks with the farthest strategy: the first landmark is
+        the node farthest from the first node of the graph, and every next landmark is the
+        node farthest from the landmarks picked so far. It runs k + 1 dijkstra searches.
+
+        Args:
+            g (Graph): Graph object
+            k (int): Number of landmarks
+
+        Returns:
+            landmarks (Landmarks): Preprocessing of the graph
+        """
+        node_ids = array("q", g.graph.keys())  # The nodes
+        landmarks, distances = [], []  # The landmarks and their distances
+        if len(node_ids) == 0:  # Nothing to do for an empty graph
+            return cls(landmarks, node_ids, distances, graph_fingerprint(g), k)
+
+        far = g.shortest_path_lengths(node_ids[0])  # Start from the first node
+        closest = None  # Distance from every node to the closest landmark
+        for _ in range(k):  # Pick the landmarks
+            landmark = max(far, key=far.get)  # The farthest node
+            if landmark in landmarks:  # Every reachable node is a landmark already
+                break
+            lengths = g.shortest_path_lengths(landmark)  # Distances from the landmark
+            landmarks.append(landmark)  # Add the landmark
+            distances.append(
+                array("d", (lengths.get(node, float("inf")) for node in node_ids))
+            )  # Store the distances in the order of the nodes
+            closest = (
+                lengths
+                if closest is None
+                else {node: min(d, lengths[node]) for node, d in closest.items()}
+            )  # Update the distance to the closest landmark
+            far = closest  # The next landmark is the farthest from all landmarks
+        return cls(landmarks, node_ids, distances, graph_fingerprint(g), k)
+
+    def matches(self, g) -> bool:
+        """
+        This function checks whether the preprocessing was computed on the given graph.
+
+        Args:
+            g (Graph): Graph object
+
+        Returns:
+            bool: True if the graph has the same nodes, edges and weights
+        """
+        return self.fingerprint == graph_fingerprint(g)  # Compare the checksums
+
+    def heuristic(self, target: int):
+        """
+        This function returns the ALT heuristic of a query.
+
+        Args:
+            target (int): Target node
+
+        Returns:
+            h (function): Function node -> lower bound of the distance to the target
+        """
+        index = self.index  # Local references are faster in the function
+        t = index[target]  # Position of the target
+        pairs = [
+            (distances[t], distances) for distances in self.distances
+        ]  # Distance from every landmark to the target, with the distance array
+
+        def h(node):
+            i = index[node]  # Position of the node
+            bound = 0  # Best lower bound so far
+            for to_target, distances in pairs:  # Iterate over the landmarks
+                to_node = distances[i]  # Distance from the landmark to the node
+                if to_target != to_node:  # Skip equal values, including inf and inf
+                    bound = max(bound, abs(to_target - to_node))
+            return bound
+
+        return h
+
+    def save(self, path: str):
+        """
+        This function writes the preprocessing to a binary file: the magic bytes, the
+        length of a JSON header, the header, the nodes and the distance arrays.
+
+        Args:
+            path (str): Path of the file
+
+        Returns:
+            None
+        """
+        header = json.dumps(
+            {
+                "landmarks": self.landmarks,
+                "k": self.k,
+                "nodes": len(self.node_ids),
+                "fingerprint": self.fingerprint,
+                "byteorder": sys.byteorder,
+            }
+        ).encode()  # Header of the file
+        with open(path, "wb") as file:
+            file.write(MAGIC)  # Magic bytes
+            file.write(len(header).to_bytes(4, "little"))  # Length of the header
+            file.write(header)  # Header
+            self.node_ids.tofile(file)  # Nodes
+            for distances in self.distances:  # Distance arrays
+                distances.tofile(file)
+
+    @classmethod
+    def load(cls, path: str) -> "Landmarks":
+        """
+        This function reads a preprocessing written by save.
+
+        Args:
+            path (str): Path of the file
+
+        Returns:
+            landmarks (Landmarks): The preprocessing
+        """
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:  # Check the magic bytes
+                raise ValueError(f"{path} is not a landmarks file")
+            length = int.from_bytes(file.read(4), "little")  # Length of the header
+            header = json.loads(file.read(length))  # Header
+            node_ids = array("q")  # Nodes
+            node_ids.fromfile(file, header["nodes"])
+            distances = []  # Distance arrays
+            for _ in header["landmarks"]:
+                distances.append(array("d"))
+                distances[-1].fromfile(file, header["nodes"])
+        if header["byteorder"] != sys.byteorder:  # Written on another machine
+            for buffer in [node_ids] + distances:
+                buffer.byteswap()
+        return cls(
+            header["landmarks"], node_ids, distances, header["fingerprint"], header["k"]
+        )
@@ -10,8 +10,6 @@ It it also used to compare the results of the algorithms. It is used to visualiz
 # Import libraries
 import random
 import argparse
-import matplotlib.pyplot as plt
-from copy import deepcopy
 
 # Import modules
 from graph import Graph
@@ -19,8 +17,9 @@ from utils import (
     initialize_graph,
     visualize_graph,
     visualize_shortest_path,
-    compare_algorithms,
 )
+from benchmark import main as benchmark
+from events import SearchRecorder
 
 # Create the parser
 parser = argparse.ArgumentParser()
@@ -34,7 +33,9 @@ parser.add_argument(
     "--viz", action="store_true", help="visualize the graph"
 )  # Visualize the graph
 
-args = parser.parse_args()  # Parse the arguments
+args, extra_args = parser.parse_known_args()  # Parse the arguments
+if extra_args and not args.compare:  # Only the benchmark has more options
+    parser.error(f"unrecognized arguments: {' '.join(extra_args)}")
 
 print(f"Welcome to the COMP 303, Project 2 Assignment!")
 
@@ -51,114 +52,10 @@ if not args.compare:
     print(f"Graph is creating with {N} nodes...", end="")
     g = initialize_graph(Graph(), N)  # Create the graph
 else:
-    N_s = [
-        10,
-        50,
-        100,
-        200,
-        500,
-        1000,
-        2000,
-    ]  # Number of nodes according to the assignment
+    # The benchmark runs without any window, the remaining arguments are its options
+    # (see python benchmark.py --help), e.g. --families grid --sizes 1000 --json out.json
     print("Comparing the results of the algorithms...")
-    source = 1  # Source node
-    a_star_times = []
-    a_star_repetitions = []
-    a_star_total_cost = []
-    dijkstra_times = []
-    dijkstra_repetitions = []
-    dijkstra_total_cost = []
-    for N in N_s:
-        print(f"Experiment is starting by creating Graph  with {N} nodes...", end="")
-
-        g1 = initialize_graph(Graph(), N)  # Create the graph
-        g2 = deepcopy(
-            g1
-        )  # Deep copy the graph to compare the results of the algorithms
-
-        target = N  # Target node
-        results = compare_algorithms(
-            g1, g2, source, target
-        )  # Compare the results of the algorithms
-        dijkstra_time, a_star_time = (
-            results["dijkstra"]["time"],
-            results["a_star"]["time"],
-        )  # Get the running times of the algorithms
-
-        dijkstra_times.append(
-            dijkstra_time
-        )  # Append the running times of the algorithms
-        a_star_times.append(a_star_time)  # Append the running times of the algorithms
-
-        dijkstra_repetition, a_star_repetition = (
-            results["dijkstra"]["repetition"],
-            results["a_star"]["repetition"],
-        )  # Get the number of repetitions of the algorithms
-
-        dijkstra_repetitions.append(
-            dijkstra_repetition
-        )  # Append the number of repetitions of the algorithms
-        a_star_repetitions.append(
-            a_star_repetition
-        )  # Append the number of repetitions of the algorithms
-
-        dijkstra_total_cost.append(
-            results["dijkstra"]["distance"]
-        )  # Append the total cost of the algorithms
-        a_star_total_cost.append(
-            results["a_star"]["distance"]
-        )  # Append the total cost of the algorithms
-
-    plt.title(
-        "Running time of Dijkstra and A* algorithms"
-    )  # Plot the running times of the algorithms
-    plt.plot(
-        N_s, dijkstra_times, label="Dijkstra"
-    )  # Plot the running times of the algorithms
-    plt.plot(N_s, a_star_times, label="A*")  # Plot the running times of the algorithms
-    plt.xlabel("Input size (number of nodes in the Graph")  # Set the x label
-    plt.ylabel("Running time (seconds)")  # Set the y label
-    plt.legend()  # Show the legend
-    plt.show()  # Show the plot
-
-    # dijkstra counters
-    plt.title(
-        "Repetitions by Dijkstra and A*"
-    )  # Plot the number of repetitions of the algorithms
-    plt.plot(
-        N_s, dijkstra_repetitions, label="Dijkstra repetitions"
-    )  # Plot the number of repetitions of the algorithms
-    plt.plot(
-        N_s, a_star_repetitions, label="A* repetitions"
-    )  # Plot the number of repetitions of the algorithms
-    plt.xlabel("Input size (number of nodes in the Graph")  # Set the x label
-    plt.ylabel("Number of Repetitions")  # Set the y label
-    plt.legend()  # Show the legend
-    plt.show()  # Show the plot
-
-    plt.title("Dijkstra Algorithm")  # Plot the total cost of the algorithms
-    plt.yscale("log")  # Set the y scale to log
-    plt.plot(
-        N_s, dijkstra_total_cost, label="Repetition"
-    )  # Plot the total cost of the algorithms
-    # plt.plot(N_s, dijkstra_theoritical, label="A* repetitions") # Plot the total cost of the algorithms
-    plt.xlabel("Input size (number of nodes in the Graph")  # Set the x label
-    plt.ylabel("Cost")  # Set the y label
-    plt.legend()  # Show the legend
-    plt.show()  # Show the plot
-
-    plt.title("A* Algorithm")  # Plot the total cost of the algorithms
-    plt.yscale("log")  # Set the y scale to log
-    plt.plot(
-        N_s, a_star_total_cost, label="Repetition"
-    )  # Plot the total cost of the algorithms
-    # plt.plot(N_s, a_star_theoritical, label="A* repetitions")
-    plt.xlabel("Input size (number of nodes in the Graph")  # Set the x label
-    plt.ylabel("Cost")  # Set the y label
-    plt.legend()  # Show the legend
-    plt.show()  #
-
-    exit(1)
+    exit(benchmark(extra_args))
 
 # Get the number of nodes from the user
 # visualize_graph(g, g.get_nodes(), g.get_edges()) if args.viz else None
@@ -173,6 +70,11 @@ while True:
             int(input("Enter the target node: ")),
         )
 
+        recorder = SearchRecorder()  # Records the order of exploration
+        metrics = shortest_path_algorithms[algorithm](
+            source, target, on_event=recorder if args.viz else None
+        )  # Get the metrics of the shortest path
+
         visualize_shortest_path(
             g,
             g.get_nodes(),
@@ -180,11 +82,9 @@ while True:
             source,
             target,
             "dijkstra" if algorithm == 0 else "a_star",
+            metrics,
+            recorder.settled(),
         ) if args.viz else None  # Visualize the shortest path if the user wants to
-
-        metrics = shortest_path_algorithms[algorithm](
-            source, target
-        )  # Get the metrics of the shortest path
         print(
             f"Predecessor list: {metrics['predecessor']}"
         )  # Print the predecessor list
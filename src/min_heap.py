@@ -12,15 +12,55 @@ class MinHeap:
     This class implements the MinHeap data structure. It is used for the dijkstra's algorithm.
     It is implemented using the list data structure.
 
+    The heap is indexed: the position of every node is kept in a dictionary that is
+    updated on every swap, so decrease_key, contains and remove run in O(log n)
+    instead of scanning the whole heap.
+
     @attributes:
         heap (list): List of tuples. Each tuple contains the distance and the node.
+        position (dict): Dictionary mapping each node in the heap to its index.
         counter (int): Number of comparisons.
     """
 
     def __init__(self):
         self.heap = []  # List of tuples. Each tuple contains the distance and the node.
+        self.position = {}  # Dictionary mapping each node to its index in the heap.
         self.counter = 0  # Number of comparisons.
 
+    def clear(self):
+        """
+        This function removes all the elements of the heap. The counter is not reset.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.heap = []  # Empty the heap.
+        self.position = {}  # Empty the position mapping.
+
+    def __len__(self):
+        """
+        This function returns the number of elements in the heap.
+
+        Returns:
+            int: Number of elements.
+        """
+        return len(self.heap)  # Size of the heap list.
+
+    def contains(self, node):
+        """
+        This function checks whether the given node is in the heap.
+
+        Args:
+            node (int): Node.
+
+        Returns:
+            bool: True if the node is in the heap, False otherwise.
+        """
+        return node in self.position  # Look up the position mapping.
+
     def push(self, val):
         """
         This function adds a new element to the heap. It uses the _bubble_up function to maintain the heap property.
@@ -32,13 +72,15 @@ class MinHeap:
             None
         """
         self.heap.append(val)  # Add the new element to the heap.
+        self.position[val[1]] = len(self.heap) - 1  # Record the position of the node.
         self._bubble_up(
             len(self.heap) - 1
         )  # Call the _bubble_up function to maintain the heap property.
 
     def pop(self):
         """
-        This function removes the root of the heap. It uses the _bubble_down function to maintain the heap property.
+        This function removes the root of the heap. The last element takes its place and
+        the _bubble_down function restores the heap property.
 
         Args:
             None
@@ -46,18 +88,23 @@ class MinHeap:
         Returns:
             val (tuple): Tuple of the distance and the node.
         """
-        self._swap(0, len(self.heap) - 1)  # Swap the root with the last element.
-        val = self.heap.pop()  # Remove the last element.
-        self._bubble_down(
-            0
-        )  # Call the _bubble_down function to maintain the heap property.
-
+        heap = self.heap
+        last = heap.pop()  # Remove the last element.
+        if not heap:  # If it was the root, the heap is empty now.
+            del self.position[last[1]]  # Forget the position of the removed node.
+            return last
+        val = heap[0]  # The root is returned.
+        del self.position[val[1]]  # Forget the position of the removed node.
+        heap[0] = last  # The last element takes the place of the root.
+        self._bubble_down(0)  # Restore the heap property.
         return val  # Return the removed element.
 
     def _bubble_up(self, index):
         """
-        This function maintains the heap property by swapping the elements.
-        It is called when a new element is added to the heap.
+        This function maintains the heap property by moving the element up.
+        It is called when a new element is added to the heap or a key is decreased.
+        The loop moves the parents down into the hole and writes the element once at the
+        end, so there is no recursion and no swap per level.
 
         Args:
             index (int): Index of the element.
@@ -65,22 +112,25 @@ class MinHeap:
         Returns:
             None
         """
-        if index == 0:  # If the index is 0, return. Because the root has no parent.
-            return  # Return
-
-        self.counter += 1  # To count the number of repetitions.
-
-        parent_index = (index - 1) // 2  # Get the parent index.
-
-        if (
-            self.heap[index] < self.heap[parent_index]
-        ):  # If the child is smaller than the parent, swap them.
-            self._swap(index, parent_index)  # Swap the elements.
-            self._bubble_up(parent_index)  # Call the function recursively.
+        heap, position = self.heap, self.position  # Local references for the loop.
+        val = heap[index]  # The element to move up.
+        counter = self.counter  # To count the number of repetitions.
+        while index > 0:  # The root has no parent.
+            counter += 1
+            parent_index = (index - 1) // 2  # Get the parent index.
+            parent = heap[parent_index]
+            if not val < parent:  # If the parent is not larger, stop.
+                break
+            heap[index] = parent  # Move the parent down.
+            position[parent[1]] = index
+            index = parent_index  # Continue from the parent.
+        heap[index] = val  # Write the element in the hole.
+        position[val[1]] = index
+        self.counter = counter
 
     def _bubble_down(self, index):
         """
-        This function maintains the heap property by swapping the elements.
+        This function maintains the heap property by moving the element down.
         It is called when the root is removed from the heap.
 
         Args:
@@ -89,35 +139,24 @@ class MinHeap:
         Returns:
             None
         """
-        left_child_index = 2 * index + 1  # Get the left child index.
-        right_child_index = 2 * index + 2  # Get the right child index.
-
-        if left_child_index >= len(
-            self.heap
-        ):  # If the left child index is greater than the length of the heap,
-            return  # return.
-
-        if right_child_index >= len(
-            self.heap
-        ):  # If the right child index is greater than the length of the heap,
-            min_index = left_child_index  # the minimum index is the left child index.
-        else:
-            if (
-                self.heap[left_child_index] < self.heap[right_child_index]
-            ):  # If the left child is smaller than the right child,
-                min_index = (
-                    left_child_index  # the minimum index is the left child index.
-                )
-            else:  # Otherwise,
-                min_index = (
-                    right_child_index  # the minimum index is the right child index.
-                )
-
-        if (
-            self.heap[index] > self.heap[min_index]
-        ):  # If the parent is greater than the child,
-            self._swap(index, min_index)  # swap them.
-            self._bubble_down(min_index)  # Call the function recursively.
+        heap, position = self.heap, self.position  # Local references for the loop.
+        size = len(heap)
+        val = heap[index]  # The element to move down.
+        while True:
+            child = 2 * index + 1  # Get the left child index.
+            if child >= size:  # If there is no child, stop.
+                break
+            right = child + 1  # Get the right child index.
+            if right < size and not heap[child] < heap[right]:  # The smaller child
+                child = right
+            smaller = heap[child]
+            if not val > smaller:  # If the element is not larger than the child, stop.
+                break
+            heap[index] = smaller  # Move the child up.
+            position[smaller[1]] = index
+            index = child  # Continue from the child.
+        heap[index] = val  # Write the element in the hole.
+        position[val[1]] = index
 
     def decrease_key(self, node, new_distance):
         """
@@ -131,17 +170,39 @@ class MinHeap:
         Returns:
             None
         """
-        for i, (distance, node_) in enumerate(self.heap):  # Iterate over the heap.
-            if node_ == node:  # If the node is found,
-                self.heap[i] = (new_distance, node_)  # update the distance.
-                self._bubble_up(
-                    i
-                )  # Call the _bubble_up function to maintain the heap property.
-                break  # Break the loop.
+        i = self.position.get(node)  # Find the index of the node.
+        if i is None:  # If the node is not in the heap,
+            return  # there is nothing to decrease.
+        self.heap[i] = (new_distance, node)  # Update the distance.
+        self._bubble_up(
+            i
+        )  # Call the _bubble_up function to maintain the heap property.
+
+    def remove(self, node):
+        """
+        This function removes the given node from the heap.
+
+        Args:
+            node (int): Node.
+
+        Returns:
+            val (tuple): Tuple of the distance and the node, or None if the node is not in the heap.
+        """
+        i = self.position.get(node)  # Find the index of the node.
+        if i is None:  # If the node is not in the heap,
+            return None  # there is nothing to remove.
+        last_index = len(self.heap) - 1  # Index of the last element.
+        self._swap(i, last_index)  # Swap the node with the last element.
+        val = self.heap.pop()  # Remove the node.
+        del self.position[node]  # Forget the position of the removed node.
+        if i < last_index:  # If another element took the place of the node,
+            self._bubble_up(i)  # restore the heap property upwards
+            self._bubble_down(self.position[self.heap[i][1]])  # and downwards.
+        return val  # Return the removed element.
 
     def _swap(self, index1, index2):
         """
-        This function swaps the elements of the heap. It is used by the _bubble_up and _bubble_down functions.
+        This function swaps the elements of the heap. It is used by the remove function to move the removed node to the end.
 
         Args:
             index1 (int): Index of the first element.
@@ -152,3 +213,5 @@ class MinHeap:
         """
         # Swap the elements. It is important to use the tuple unpacking.
         self.heap[index1], self.heap[index2] = self.heap[index2], self.heap[index1]
+        self.position[self.heap[index1][1]] = index1  # Update the positions
+        self.position[self.heap[index2][1]] = index2  # of both nodes.
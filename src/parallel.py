@@ -0,0 +1,163 @@
+"""
+@description: This file contains the ParallelQueryExecutor class. It answers batches of queries with a pool of worker processes that share one copy of the graph.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+
+# Import modules
+from csr_graph import CSRGraph, first_id
+
+ALGORITHMS = (
+    "dijkstra",
+    "a_star",
+    "bidirectional_dijkstra",
+    "bidirectional_a_star",
+)  # Searches that can be run by the workers
+
+_graph = None  # Graph of the worker process, built on the shared memory
+_blocks = []  # Shared memory blocks of the worker process
+
+
+def _attach(layout, first):
+    """
+    This function is the initializer of the worker processes. It attaches to the shared
+    memory blocks and builds a CSRGraph directly on them, without copying the buffers.
+    The index of the graph is shared too: the rows are computed from the ids if they are
+    contiguous, and found with a binary search in the shared sorted ids otherwise.
+
+    Args:
+        layout (list): (name, typecode, length) of the node_ids, offsets, neighbors,
+            weights, xs and ys buffers, followed by the sorted ids and their rows if the
+            ids are not contiguous
+        first (int): Id of the first node if the ids are contiguous, None otherwise
+
+    Returns:
+        None
+    """
+    global _graph
+    buffers = []  # Views of the buffers
+    for name, typecode, length in layout:  # Attach to every block
+        block = SharedMemory(name=name)  # Open the block, the parent unlinks it
+        _blocks.append(block)  # Keep the block open while the worker lives
+        itemsize = 8  # Both typecodes "q" and "d" use 8 bytes
+        buffers.append(block.buf[: length * itemsize].cast(typecode))
+    sorted_ids, sorted_rows = buffers[6:] if first is None else (None, None)
+    _graph = CSRGraph.from_buffers(
+        *buffers[:6], first=first, sorted_ids=sorted_ids, sorted_rows=sorted_rows
+    )  # Build the graph on the shared buffers
+
+
+def _run_query(task):
+    """
+    This function runs one query in a worker process.
+
+    Args:
+        task (tuple): (algorithm, source, target, options, keep_predecessor)
+
+    Returns:
+        metrics (dict): metrics of the search
+    """
+    algorithm, source, target, options, keep_predecessor = task
+    metrics = getattr(_graph, algorithm)(source, target, **options)  # Run the search
+    if not keep_predecessor:  # The predecessor mapping is large to send back
+        metrics.pop("predecessor", None)
+    return metrics
+
+
+class ParallelQueryExecutor:
+    """
+    This class fans batches of shortest path queries out to a pool of worker processes.
+    The graph is frozen and its CSR buffers are copied once into shared memory, so the
+    workers read the same pages and only the queries and results are pickled. The index
+    from node ids to rows is shared as well, so a worker keeps no O(V) copy of its own.
+    It should be closed, or used in a with statement, to free the shared memory.
+
+    @attributes:
+        processes (int): Number of worker processes.
+        blocks (list): Shared memory blocks holding the CSR buffers.
+        pool (Pool): Pool of worker processes.
+    """
+
+    def __init__(self, g, processes: int = None):
+        csr = g.freeze()  # CSR buffers of the graph
+        buffers = [
+            csr.node_ids,
+            csr.offsets,
+            csr.neighbors,
+            csr.weights,
+            csr.xs,
+            csr.ys,
+        ]
+        first = first_id(csr.node_ids)  # None if the ids are not contiguous
+        if first is None:  # Share the sorted ids and their rows
+            buffers.extend(csr.sorted_index())
+        self.blocks = []  # Shared memory blocks
+        layout = []  # Description of the blocks for the workers
+        for buffer in buffers:  # Copy every buffer into a block
+            view = memoryview(buffer).cast("B")  # Raw bytes of the buffer
+            block = SharedMemory(create=True, size=max(view.nbytes, 1))
+            block.buf[: view.nbytes] = view  # Copy the bytes
+            self.blocks.append(block)
+            layout.append((block.name, memoryview(buffer).format, len(buffer)))
+        self.processes = processes or multiprocessing.cpu_count()  # Pool size
+        self.pool = multiprocessing.Pool(
+            self.processes, initializer=_attach, initargs=(layout, first)
+        )  # Start the workers
+
+    def run(
+        self,
+        queries,
+        algorithm: str = "dijkstra",
+        chunksize: int = 64,
+        keep_predecessor: bool = False,
+        **options,
+    ):
+        """
+        This function runs a batch of queries in parallel and returns the results in the
+        order of the queries.
+
+        Args:
+            queries (list): (source, target) pairs
+            algorithm (str): search to run, one of ALGORITHMS
+            chunksize (int): number of queries sent to a worker at a time
+            keep_predecessor (bool): whether to return the predecessor mappings
+            **options: options of the search, e.g. lazy=True or heuristic="manhattan"
+
+        Returns:
+            results (list): metrics of the queries
+        """
+        if algorithm not in ALGORITHMS:  # Check the algorithm
+            raise ValueError(
+                f"Unknown algorithm {algorithm!r}, expected one of {ALGORITHMS}"
+            )
+        tasks = [
+            (algorithm, source, target, options, keep_predecessor)
+            for source, target in queries
+        ]  # One task per query
+        return self.pool.map(_run_query, tasks, chunksize)  # Results in order
+
+    def close(self):
+        """
+        This function stops the workers and frees the shared memory.
+
+        Returns:
+            None
+        """
+        self.pool.close()  # No more tasks
+        self.pool.join()  # Wait for the workers
+        for block in self.blocks:  # Free the shared memory
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
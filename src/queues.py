@@ -0,0 +1,730 @@
+"""
+@description: This file contains the priority queue backends of the searches: an iterative d-ary heap, a pairing heap, a radix heap and a bucket queue, and the registry used to select them.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import modules
+from min_heap import MinHeap
+
+## NOTE: The queue interface ##
+# Every backend has the interface of MinHeap that the searches use: push((key, node)),
+# pop() -> (key, node) with the smallest key, decrease_key(node, key), contains(node),
+# remove(node), len(queue) and clear(), and it keeps the nodes it holds in position, so
+# the counting and event heaps of stats.py and events.py can wrap it. The counter has the
+# same meaning for every backend, the one of MinHeap: the number of key comparisons made
+# to place the elements that are pushed or whose key is decreased. The radix heap and the
+# bucket queue place an element with one bucket computation, which counts as one
+# comparison, so the repetition of a search stays on the same scale whatever its queue.
+# Only MinHeap and DaryHeap store their elements in a heap list, so a search must test
+# len(queue) and not queue.heap to know whether the queue is empty.
+QUEUES = {}  # Queue classes by name
+
+DIAL_MAX_WEIGHT = 256  # Largest weight for which dijkstra may choose the bucket queue
+
+
+def register_queue(name: str, queue=None):
+    """
+    This function registers a queue class under the given name, so it can be selected
+    per query with dijkstra(..., queue=name). Without a class, it returns a decorator
+    that registers the decorated class.
+
+    Args:
+        name (str): Name of the queue
+        queue (class): Subclass of MinHeap whose constructor takes no argument
+
+    Returns:
+        queue (class): The same class, or a decorator if no class is given
+    """
+    if queue is None:  # Used as a decorator
+        return lambda queue: register_queue(name, queue)
+    QUEUES[name] = queue  # Add the class to the registry
+    return queue
+
+
+def get_queue(queue):
+    """
+    This function returns the queue class of a search.
+
+    Args:
+        queue (str or class): Name of a registered queue, a subclass of MinHeap, or
+            None for MinHeap
+
+    Returns:
+        queue (class): The queue class
+    """
+    if queue is None:  # Use the binary heap
+        return MinHeap
+    if isinstance(queue, type):  # Use the given class
+        return queue
+    if queue not in QUEUES:  # Check the name
+        raise ValueError(f"Unknown queue {queue!r}, expected one of {sorted(QUEUES)}")
+    return QUEUES[queue]
+
+
+def prefers_buckets(bound, nodes: int) -> bool:
+    """
+    This function decides whether dijkstra uses the bucket queue when no queue is given.
+    A search with the bucket queue scans every bucket up to the largest distance D, so it
+    only pays off when D is small compared to the number of nodes. D is estimated as the
+    largest weight times sqrt(nodes) hops, the length of a path across a square grid.
+    On the banded graphs of initialize_graph the weights grow with the number of nodes,
+    so they always keep MinHeap.
+
+    Args:
+        bound (int): Largest edge weight, None if a weight is not a non-negative integer
+        nodes (int): Number of nodes of the graph
+
+    Returns:
+        bool: True if the bucket queue should be used, False otherwise
+    """
+    if bound is None or bound > DIAL_MAX_WEIGHT:  # Not small integers
+        return False
+    return bound * bound <= nodes  # bound * sqrt(nodes) <= nodes
+
+
+_combined = {}  # Classes built by with_queue
+
+
+def with_queue(wrapper, queue):
+    """
+    This function returns a class that adds the behavior of a MinHeap subclass, like
+    CountingMinHeap or EventMinHeap, to another queue class.
+
+    Args:
+        wrapper (class): Subclass of MinHeap that overrides push, pop and decrease_key
+        queue (class): Queue class
+
+    Returns:
+        combined (class): wrapper on top of the queue, or wrapper for MinHeap
+    """
+    if queue is MinHeap:  # Nothing to combine
+        return wrapper
+    key = (wrapper, queue)
+    if key not in _combined:  # Build the class once
+        name = wrapper.__name__.replace("MinHeap", queue.__name__)
+        _combined[key] = type(name, (wrapper, queue), {})
+    return _combined[key]
+
+
+register_queue("binary", MinHeap)
+
+
+@register_queue("4-ary")
+class DaryHeap(MinHeap):
+    """
+    This class is a MinHeap in which every element has d children instead of 2. The heap
+    is about half as deep for d = 4, so push and decrease_key move elements fewer times,
+    while pop compares more children per level. The children are read from a contiguous
+    part of the list, which suits the cache.
+
+    @attributes:
+        arity (int): Number of children of every element.
+    """
+
+    def __init__(self, arity: int = 4):
+        super().__init__()  # Inherit MinHeap class
+        if arity < 2:  # Check the arity
+            raise ValueError(f"arity must be at least 2, got {arity}")
+        self.arity = arity
+
+    def _bubble_up(self, index):
+        """
+        This function maintains the heap property by moving the element up. The parent of
+        the element at index i is at (i - 1) // arity, and the comparisons are counted.
+
+        Args:
+            index (int): Index of the element.
+
+        Returns:
+            None
+        """
+        heap, position, arity = self.heap, self.position, self.arity
+        val = heap[index]  # The element to move up
+        counter = self.counter
+        while index > 0:  # The root has no parent
+            counter += 1
+            parent_index = (index - 1) // arity
+            parent = heap[parent_index]
+            if not val < parent:  # If the parent is not larger, stop
+                break
+            heap[index] = parent  # Move the parent down
+            position[parent[1]] = index
+            index = parent_index
+        heap[index] = val  # Write the element in the hole
+        position[val[1]] = index
+        self.counter = counter
+
+    def _bubble_down(self, index):
+        """
+        This function maintains the heap property by moving the element down. The children
+        of the element at index i are at arity * i + 1, ..., arity * i + arity, and the
+        smallest of them is compared with the element.
+
+        Args:
+            index (int): Index of the element.
+
+        Returns:
+            None
+        """
+        heap, position, arity = self.heap, self.position, self.arity
+        size = len(heap)
+        val = heap[index]  # The element to move down
+        while True:
+            first = arity * index + 1  # First child
+            if first >= size:  # If there is no child, stop
+                break
+            child, smaller = first, heap[first]
+            for i in range(first + 1, min(first + arity, size)):  # The smallest child
+                if heap[i] < smaller:
+                    child, smaller = i, heap[i]
+            if not val > smaller:  # If the element is not larger than the child, stop
+                break
+            heap[index] = smaller  # Move the child up
+            position[smaller[1]] = index
+            index = child
+        heap[index] = val  # Write the element in the hole
+        position[val[1]] = index
+
+
+class _PairingNode:
+    """
+    This class is an element of a PairingHeap. The children of a node form a linked list;
+    prev is the previous sibling, or the parent for the first child.
+    """
+
+    __slots__ = ("val", "child", "next", "prev")
+
+    def __init__(self, val):
+        self.val = val  # (key, node)
+        self.child = None
+        self.next = None
+        self.prev = None
+
+
+@register_queue("pairing")
+class PairingHeap(MinHeap):
+    """
+    This class is a pairing heap: a tree where every node is smaller than its children.
+    push and decrease_key link one tree to the root in O(1), and pop merges the children
+    of the root in pairs, in O(log n) amortized time. It wins when there are many more
+    decrease_key operations than pops, like in the eager mode of dijkstra.
+
+    @attributes:
+        root (_PairingNode): Root of the tree, None if the heap is empty.
+        position (dict): Dictionary mapping each node in the heap to its tree node.
+        size (int): Number of elements.
+        counter (int): Number of comparisons of push, decrease_key and remove.
+    """
+
+    def __init__(self):  # The heap list of MinHeap is not used
+        self.root = None
+        self.position = {}
+        self.size = 0
+        self.counter = 0
+
+    def clear(self):
+        """
+        This function removes all the elements of the heap. The counter is not reset.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.root = None
+        self.position = {}
+        self.size = 0
+
+    def __len__(self):
+        """
+        This function returns the number of elements in the heap.
+
+        Returns:
+            int: Number of elements.
+        """
+        return self.size
+
+    def _link(self, first: _PairingNode, second: _PairingNode) -> _PairingNode:
+        """Makes the tree with the larger root the first child of the other one."""
+        if second.val < first.val:
+            first, second = second, first
+        second.prev = first
+        second.next = first.child
+        if first.child is not None:
+            first.child.prev = second
+        first.child = second
+        return first
+
+    def _merge_pairs(self, first: _PairingNode) -> _PairingNode:
+        """Merges a list of siblings into one tree: in pairs from left to right, then
+        the pairs from right to left."""
+        if first is None:
+            return None
+        pairs = []
+        while first is not None:  # Link the siblings in pairs
+            second = first.next
+            if second is None:
+                first.prev = first.next = None
+                pairs.append(first)
+                break
+            following = second.next
+            first.prev = first.next = second.prev = second.next = None
+            pairs.append(self._link(first, second))
+            first = following
+        tree = pairs.pop()
+        while pairs:  # Link the pairs from the last one
+            tree = self._link(pairs.pop(), tree)
+        return tree
+
+    def _cut(self, entry: _PairingNode):
+        """Detaches a tree node, with its children, from its parent."""
+        if entry.prev.child is entry:  # First child
+            entry.prev.child = entry.next
+        else:
+            entry.prev.next = entry.next
+        if entry.next is not None:
+            entry.next.prev = entry.prev
+        entry.prev = entry.next = None
+
+    def push(self, val):
+        """
+        This function adds a new element to the heap as a tree of one node, linked to the
+        root with one comparison.
+
+        Args:
+            val (tuple): Tuple of the distance and the node.
+
+        Returns:
+            None
+        """
+        entry = _PairingNode(val)
+        self.position[val[1]] = entry
+        if self.root is None:
+            self.root = entry
+        else:  # One comparison with the root
+            self.counter += 1
+            self.root = self._link(self.root, entry)
+        self.size += 1
+
+    def pop(self):
+        """
+        This function removes the root of the heap. Its children are merged in pairs into
+        the new tree.
+
+        Args:
+            None
+
+        Returns:
+            val (tuple): Tuple of the distance and the node.
+        """
+        root = self.root
+        if root is None:
+            raise IndexError("pop from an empty heap")
+        self.root = self._merge_pairs(root.child)
+        del self.position[root.val[1]]
+        self.size -= 1
+        return root.val
+
+    def decrease_key(self, node, new_distance):
+        """
+        This function decreases the distance of the given node. The subtree of the node is
+        cut from its parent and linked to the root.
+
+        Args:
+            node (int): Node.
+            new_distance (int): New distance.
+
+        Returns:
+            None
+        """
+        entry = self.position.get(node)
+        if entry is None:  # If the node is not in the heap, there is nothing to do
+            return
+        entry.val = (new_distance, node)
+        if entry is not self.root:  # Move the subtree of the node to the root
+            self.counter += 1
+            self._cut(entry)
+            self.root = self._link(self.root, entry)
+
+    def remove(self, node):
+        """
+        This function removes the given node from the heap. Its children are merged and
+        linked to the root in its place.
+
+        Args:
+            node (int): Node.
+
+        Returns:
+            val (tuple): Tuple of the distance and the node, or None if the node is not in the heap.
+        """
+        entry = self.position.get(node)
+        if entry is None:  # If the node is not in the heap, there is nothing to remove
+            return None
+        if entry is self.root:
+            return self.pop()
+        self._cut(entry)  # Put the children of the node in its place
+        subtree = self._merge_pairs(entry.child)
+        if subtree is not None:
+            self.counter += 1
+            self.root = self._link(self.root, subtree)
+        del self.position[node]
+        self.size -= 1
+        return entry.val
+
+
+@register_queue("radix")
+class RadixHeap(MinHeap):
+    """
+    This class is a monotone radix heap for integer keys. An element is stored in the
+    bucket given by the highest bit in which its key differs from the last popped key.
+    When bucket 0 is empty, the first non-empty bucket is emptied into the lower buckets
+    around its smallest key, and every element moves at most once per bit of the keys.
+    There are no comparisons between elements. The keys must be non-negative integers,
+    or infinity, and never smaller than the last popped key, which is true for dijkstra
+    and for A* with a consistent heuristic.
+
+    @attributes:
+        buckets (list): Lists of (key, node) elements, by bucket.
+        infinite (list): Elements with an infinite key.
+        last (int): Last popped key.
+        position (dict): Dictionary mapping each node in the heap to its (bucket, index).
+        size (int): Number of elements.
+        counter (int): Number of elements placed by push and decrease_key.
+    """
+
+    INFINITE = -1  # Bucket of the infinite keys in position
+
+    def __init__(self):  # The heap list of MinHeap is not used
+        self.buckets = [[]]
+        self.infinite = []
+        self.last = 0
+        self.position = {}
+        self.size = 0
+        self.counter = 0
+
+    def clear(self):
+        """
+        This function removes all the elements of the heap. The counter is not reset.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.buckets = [[]]
+        self.infinite = []
+        self.last = 0
+        self.position = {}
+        self.size = 0
+
+    def __len__(self):
+        """
+        This function returns the number of elements in the heap.
+
+        Returns:
+            int: Number of elements.
+        """
+        return self.size
+
+    def _bucket(self, key) -> int:
+        """Returns the bucket of a key."""
+        if key == self.last:
+            return 0
+        if key == float("inf"):
+            return self.INFINITE
+        if key != int(key) or key < self.last:
+            raise ValueError(
+                f"RadixHeap needs integer keys that are not smaller than the last "
+                f"popped key {self.last}, got {key!r}"
+            )
+        return (int(key) ^ self.last).bit_length()
+
+    def _insert(self, val):
+        """Adds an element to its bucket."""
+        bucket = self._bucket(val[0])
+        if bucket == self.INFINITE:
+            elements = self.infinite
+        else:
+            while bucket >= len(self.buckets):  # New highest bit
+                self.buckets.append([])
+            elements = self.buckets[bucket]
+        self.position[val[1]] = (bucket, len(elements))
+        elements.append(val)
+
+    def _delete(self, node):
+        """Removes an element from its bucket, moving the last element of the bucket
+        into its place."""
+        bucket, i = self.position.pop(node)
+        elements = self.infinite if bucket == self.INFINITE else self.buckets[bucket]
+        val, last = elements[i], elements.pop()
+        if last is not val:  # Fill the hole
+            elements[i] = last
+            self.position[last[1]] = (bucket, i)
+        return val
+
+    def push(self, val):
+        """
+        This function adds a new element to the bucket of its key.
+
+        Args:
+            val (tuple): Tuple of the distance and the node.
+
+        Returns:
+            None
+        """
+        self._insert(val)
+        self.size += 1
+        self.counter += 1
+
+    def pop(self):
+        """
+        This function removes an element with the smallest key. If bucket 0 is empty, the
+        first non-empty bucket is emptied into the lower buckets around its smallest key.
+
+        Args:
+            None
+
+        Returns:
+            val (tuple): Tuple of the distance and the node.
+        """
+        buckets = self.buckets
+        if not buckets[0]:  # Refill bucket 0
+            for bucket in range(1, len(buckets)):
+                if buckets[bucket]:
+                    break
+            else:  # Only infinite keys are left
+                if not self.infinite:
+                    raise IndexError("pop from an empty heap")
+                self.size -= 1
+                val = self.infinite.pop()
+                del self.position[val[1]]
+                return val
+            elements, buckets[bucket] = buckets[bucket], []
+            self.last = int(min(elements)[0])  # The smallest key of the bucket
+            for val in elements:  # Move the elements to the lower buckets
+                self._insert(val)
+        self.size -= 1
+        val = buckets[0].pop()
+        del self.position[val[1]]
+        return val
+
+    def decrease_key(self, node, new_distance):
+        """
+        This function decreases the distance of the given node by moving it to the bucket
+        of its new key.
+
+        Args:
+            node (int): Node.
+            new_distance (int): New distance.
+
+        Returns:
+            None
+        """
+        if node not in self.position:  # If the node is not in the heap, do nothing
+            return
+        self._delete(node)
+        self._insert((new_distance, node))
+        self.counter += 1
+
+    def remove(self, node):
+        """
+        This function removes the given node from the heap.
+
+        Args:
+            node (int): Node.
+
+        Returns:
+            val (tuple): Tuple of the distance and the node, or None if the node is not in the heap.
+        """
+        if node not in self.position:  # If the node is not in the heap, do nothing
+            return None
+        self.size -= 1
+        return self._delete(node)
+
+
+@register_queue("dial")
+class BucketQueue(MinHeap):
+    """
+    This class is the bucket queue of Dial's algorithm for integer keys. Bucket i holds
+    the elements whose key is i modulo the number of buckets, and pop scans the buckets
+    circularly from the last popped key. With edge weights of at most C, the keys in the
+    queue of dijkstra are never more than C apart, so C + 1 buckets are enough and a
+    search runs in O(E + D) time, where D is the largest distance, without comparing any
+    elements. The number of buckets is doubled when a key is too far ahead. The keys
+    must be non-negative integers, or infinity, and never smaller than the last popped key.
+
+    @attributes:
+        buckets (list): Lists of (key, node) elements, by key modulo the number of buckets.
+        infinite (list): Elements with an infinite key.
+        current (int): Last popped key, the smallest key in the queue.
+        position (dict): Dictionary mapping each node in the queue to its (bucket, index).
+        size (int): Number of elements.
+        finite (int): Number of elements with a finite key.
+        counter (int): Number of elements placed by push and decrease_key.
+    """
+
+    INFINITE = -1  # Bucket of the infinite keys in position
+
+    def __init__(self, width: int = 64):  # The heap list of MinHeap is not used
+        self.buckets = [[] for _ in range(width)]
+        self.infinite = []
+        self.current = 0
+        self.position = {}
+        self.size = 0
+        self.finite = 0
+        self.counter = 0
+
+    def clear(self):
+        """
+        This function removes all the elements of the queue. The counter is not reset.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.buckets = [[] for _ in self.buckets]
+        self.infinite = []
+        self.current = 0
+        self.position = {}
+        self.size = 0
+        self.finite = 0
+
+    def __len__(self):
+        """
+        This function returns the number of elements in the queue.
+
+        Returns:
+            int: Number of elements.
+        """
+        return self.size
+
+    def _insert(self, val):
+        """Adds an element to its bucket."""
+        key = val[0]
+        if key == float("inf"):
+            bucket, elements = self.INFINITE, self.infinite
+        else:
+            if key != int(key) or key < self.current:
+                raise ValueError(
+                    f"BucketQueue needs integer keys that are not smaller than the last "
+                    f"popped key {self.current}, got {key!r}"
+                )
+            if key - self.current >= len(self.buckets):  # Too far ahead
+                self._grow(int(key) - self.current + 1)
+            bucket = int(key) % len(self.buckets)
+            elements = self.buckets[bucket]
+            self.finite += 1
+        self.position[val[1]] = (bucket, len(elements))
+        elements.append(val)
+
+    def _delete(self, node):
+        """Removes an element from its bucket, moving the last element of the bucket
+        into its place."""
+        bucket, i = self.position.pop(node)
+        if bucket == self.INFINITE:
+            elements = self.infinite
+        else:
+            elements = self.buckets[bucket]
+            self.finite -= 1
+        val, last = elements[i], elements.pop()
+        if last is not val:  # Fill the hole
+            elements[i] = last
+            self.position[last[1]] = (bucket, i)
+        return val
+
+    def _grow(self, width: int):
+        """Doubles the number of buckets until there are at least width of them."""
+        elements = [val for bucket in self.buckets for val in bucket]
+        size = len(self.buckets)
+        while size < width:
+            size *= 2
+        self.buckets = [[] for _ in range(size)]
+        self.finite -= len(elements)
+        for val in elements:  # Put the elements in their new buckets
+            self._insert(val)
+
+    def push(self, val):
+        """
+        This function adds a new element to the bucket of its key, growing the buckets if
+        the key is too far ahead of the last popped key.
+
+        Args:
+            val (tuple): Tuple of the distance and the node.
+
+        Returns:
+            None
+        """
+        self._insert(val)
+        self.size += 1
+        self.counter += 1
+
+    def pop(self):
+        """
+        This function removes an element with the smallest key. The buckets are scanned
+        circularly from the last popped key to the first non-empty one.
+
+        Args:
+            None
+
+        Returns:
+            val (tuple): Tuple of the distance and the node.
+        """
+        if not self.finite:  # Only infinite keys are left
+            if not self.infinite:
+                raise IndexError("pop from an empty heap")
+            val = self.infinite.pop()
+            del self.position[val[1]]
+            self.size -= 1
+            return val
+        buckets, width = self.buckets, len(self.buckets)
+        current = self.current
+        elements = buckets[current % width]
+        while not elements:  # Scan the buckets up to the next key
+            current += 1
+            elements = buckets[current % width]
+        self.current = current
+        val = elements.pop()
+        del self.position[val[1]]
+        self.finite -= 1
+        self.size -= 1
+        return val
+
+    def decrease_key(self, node, new_distance):
+        """
+        This function decreases the distance of the given node by moving it to the bucket
+        of its new key.
+
+        Args:
+            node (int): Node.
+            new_distance (int): New distance.
+
+        Returns:
+            None
+        """
+        if node not in self.position:  # If the node is not in the queue, do nothing
+            return
+        self._delete(node)
+        self._insert((new_distance, node))
+        self.counter += 1
+
+    def remove(self, node):
+        """
+        This function removes the given node from the queue.
+
+        Args:
+            node (int): Node.
+
+        Returns:
+            val (tuple): Tuple of the distance and the node, or None if the node is not in the queue.
+        """
+        if node not in self.position:  # If the node is not in the queue, do nothing
+            return None
+        self.size -= 1
+        return self._delete(node)
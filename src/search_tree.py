@@ -0,0 +1,207 @@
+"""
+@description: This file contains the SearchTree and SearchTreePool classes. They keep dijkstra searches alive between queries from the same source.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import threading
+from collections import OrderedDict
+
+# Import modules
+from min_heap import MinHeap
+
+
+class SearchTree:
+    """
+    This class is a lazy dijkstra search from one source that can be suspended and resumed.
+    The search stops as soon as the requested target is settled and keeps its distances,
+    parents and heap, so a later query for a settled node is a lookup, and a query for a
+    farther node continues the same search instead of starting over.
+
+    @attributes:
+        graph (Graph): The graph that is searched.
+        source (int): The source node.
+        distances (dict): Best known distance of every reached node.
+        parents (dict): Parent of every reached node, the source is its own parent.
+        heap (MinHeap): Reached nodes that are not settled yet.
+        settled (dict): Final distance of every settled node.
+    """
+
+    def __init__(self, graph, source: int):
+        self.graph = graph
+        self.source = source
+        self.distances = {source: 0}
+        self.parents = {source: source}
+        self.heap = MinHeap()
+        self.heap.push((0, source))  # (distance, node)
+        self.settled = {}
+
+    def __len__(self):
+        return len(self.distances)  # Number of reached nodes, a measure of the memory
+
+    def run_until(self, target: int) -> int:
+        """
+        This function resumes the search until the target is settled or every reachable
+        node is settled.
+
+        Args:
+            target (int): Target node
+
+        Returns:
+            repetition (int): Number of distance updates made by this call
+        """
+        graph, distances, parents = self.graph.graph, self.distances, self.parents
+        heap, settled = self.heap, self.settled  # Local references for the loop
+        repetition = 0  # Number of distance updates
+        while target not in settled and heap.heap:  # Until the target is settled
+            distance, node = heap.pop()  # Pop the node with the smallest distance
+            settled[node] = distance  # Its distance is final
+            for neighbor, weight in graph[node]:  # Relax the edges
+                new_distance = distance + weight  # Calculate the new distance
+                if new_distance < distances.get(neighbor, float("inf")):
+                    repetition += 1  # Increment the number of repetitions
+                    distances[neighbor] = new_distance  # Update the distance
+                    parents[neighbor] = node  # Update the parent
+                    if heap.contains(neighbor):  # If the neighbor is in the heap
+                        heap.decrease_key(neighbor, new_distance)  # decrease its key
+                    else:  # If it is reached for the first time
+                        heap.push((new_distance, neighbor))  # push it to the heap
+        return repetition
+
+    def query(self, target: int, viz: bool = False):
+        """
+        This function answers a query from the source of the tree, resuming the search
+        only if the target is not settled yet.
+
+        Args:
+            target (int): Target node
+            viz (bool): Whether the predecessor of the source should be None
+
+        Returns:
+            metrics (dict): dictionary containing the number of visited nodes, the number of
+                repetitions, the path and the distance of the shortest path from the source
+                to the target node in the graph
+        """
+        metrics = {
+            "visited": 0,
+            "repetition": self.run_until(target),
+            "path": [],
+            "distance": 0,
+        }  # Initialize the metrics
+        if target not in self.settled:  # The target is not reachable
+            return metrics
+
+        path = [target]  # Follow the parents back to the source
+        while path[-1] != self.source:
+            path.append(self.parents[path[-1]])
+        path.reverse()
+
+        # The tree keeps growing, so only the parents along the path are returned.
+        predecessor = {self.source: None if viz else self.source}
+        for previous, node in zip(path, path[1:]):
+            predecessor[node] = previous
+        metrics["visited"] = len(path)  # Set the number of visited nodes
+        metrics["path"] = path  # Set the path
+        metrics["distance"] = self.settled[target]  # Set the distance
+        metrics["predecessor"] = predecessor  # Set the predecessor mapping
+        return metrics
+
+
+class SearchTreePool:
+    """
+    This class keeps the search trees of the most recently used sources. It is bounded
+    both by the number of trees and by the total number of reached nodes, and it evicts
+    the least recently used trees first. Like LRUCache, it empties itself when it is used
+    with another version of the graph. The trees are modified by the queries, so a lock
+    lets only one query use the pool at a time.
+
+    @attributes:
+        max_trees (int): Largest number of trees.
+        max_nodes (int): Largest total number of reached nodes over all trees.
+        trees (OrderedDict): The trees by source, from the least to the most recently used.
+        version (int): Version of the graph the trees belong to.
+        hits (int): Number of queries answered by a lookup.
+        resumes (int): Number of queries that resumed an existing tree.
+        misses (int): Number of queries that started a new tree.
+        evictions (int): Number of trees removed to respect the bounds.
+        lock (Lock): Lock of the trees and the statistics.
+    """
+
+    def __init__(self, max_trees: int = 16, max_nodes: int = 1_000_000):
+        if max_trees < 1:  # Check the bounds
+            raise ValueError(f"max_trees must be at least 1, got {max_trees}")
+        self.max_trees = max_trees
+        self.max_nodes = max_nodes
+        self.trees = OrderedDict()
+        self.version = 0
+        self.hits = 0
+        self.resumes = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def query(self, graph, source: int, target: int, viz: bool = False):
+        """
+        This function answers a query with the tree of the source, creating it if needed.
+
+        Args:
+            graph (Graph): Graph object
+            source (int): Source node
+            target (int): Target node
+            viz (bool): Whether the predecessor of the source should be None
+
+        Returns:
+            metrics (dict): Metrics of the query, see SearchTree.query
+        """
+        with self.lock:
+            if graph.version != self.version:  # The graph has changed
+                self.trees.clear()  # The trees are out of date
+                self.version = graph.version
+            tree = self.trees.get(source)  # Tree of the source
+            if tree is None:  # Start a new search
+                self.misses += 1
+                tree = self.trees[source] = SearchTree(graph, source)
+            elif target in tree.settled:  # Answered by a lookup
+                self.hits += 1
+            else:  # Continue the search
+                self.resumes += 1
+            self.trees.move_to_end(source)  # Most recently used
+            metrics = tree.query(target, viz)  # Answer the query
+            self._evict()  # The tree may have grown
+            return metrics
+
+    def _evict(self):
+        """
+        This function removes the least recently used trees until the pool respects its
+        bounds. The most recently used tree is always kept. The lock must be held.
+
+        Returns:
+            None
+        """
+        nodes = sum(len(tree) for tree in self.trees.values())  # Total reached nodes
+        while len(self.trees) > 1 and (
+            len(self.trees) > self.max_trees or nodes > self.max_nodes
+        ):  # Too many trees or nodes
+            _, tree = self.trees.popitem(last=False)  # Least recently used tree
+            nodes -= len(tree)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        This function returns the statistics of the pool.
+
+        Returns:
+            stats (dict): number of trees and reached nodes, hits, resumes, misses and evictions
+        """
+        with self.lock:
+            return {
+                "trees": len(self.trees),
+                "nodes": sum(len(tree) for tree in self.trees.values()),
+                "hits": self.hits,
+                "resumes": self.resumes,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
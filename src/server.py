@@ -0,0 +1,369 @@
+"""
+@description: This file contains the QueryServer class. It is a long-running asyncio service that answers shortest path queries sent as JSON lines over a TCP or Unix socket.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import argparse
+import asyncio
+import inspect
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# Import modules
+from generators import FAMILIES, build_graph
+
+ALGORITHMS = (
+    "dijkstra",
+    "a_star",
+    "bidirectional_dijkstra",
+    "bidirectional_a_star",
+    "resumable_dijkstra",
+)  # Searches that can be requested
+
+## NOTE: Protocol ##
+# Every request is one line of JSON, for example
+#   {"id": 1, "source": 1, "target": 500, "algorithm": "a_star", "options": {"heuristic": "manhattan"}}
+# and every response is one line of JSON with the same id and the metrics of the search
+# without the predecessor mapping, with the statistics as a dictionary when they are
+# enabled on the graph, or an "error" message. The algorithm defaults to
+# dijkstra. The options are the keyword arguments of the search method, like "lazy" or
+# "queue", and unknown options are rejected for every algorithm. Responses are sent as
+# soon as they are ready, so they may come out of order.
+# The request {"id": 2, "op": "stats"} returns the counters of the server.
+
+
+def _batch_metrics(source: int, target: int, settled, parents, repetition: int):
+    """
+    This function builds the metrics of one target of a shared dijkstra search.
+
+    Args:
+        source (int): Source node
+        target (int): Target node
+        settled (dict): Final distances of the shared search
+        parents (dict): Parents of the shared search
+        repetition (int): Number of heap comparisons of the shared search
+
+    Returns:
+        metrics (dict): metrics of the query, as returned by Graph.dijkstra
+    """
+    metrics = {"visited": 0, "repetition": repetition, "path": [], "distance": 0}
+    if target not in settled:  # The target is not reachable
+        return metrics
+    path = [target]  # Follow the parents back to the source
+    while path[-1] != source:
+        path.append(parents[path[-1]])
+    path.reverse()
+    metrics["visited"] = len(path)  # Set the number of visited nodes
+    metrics["path"] = path  # Set the path
+    metrics["distance"] = settled[target]  # Set the distance
+    return metrics
+
+
+class QueryServer:
+    """
+    This class serves shortest path queries on a graph that is built once. The searches
+    run in a thread pool, so the event loop keeps accepting requests while they run.
+    Identical requests that arrive while the first one is still running are coalesced:
+    they wait for the same result instead of starting another search. Dijkstra requests
+    without options are micro-batched: requests from the same source that arrive within
+    batch_window seconds are answered by one search that stops when all their targets
+    are settled, and their repetition is the number of comparisons of that search.
+
+    @attributes:
+        g (Graph): The graph.
+        executor (ThreadPoolExecutor): Threads that run the searches.
+        batch_window (float): Time in seconds a dijkstra request waits for others from the same source.
+        max_batch (int): A batch is started at once when it has this many requests.
+        in_flight (dict): Futures of the running requests, by query.
+        batches (dict): Pending (target, future) pairs of the dijkstra requests, by source.
+        counters (dict): Number of requests, coalesced requests, searches, batched requests and errors.
+    """
+
+    def __init__(
+        self, g, workers: int = None, batch_window: float = 0.002, max_batch=256
+    ):
+        self.g = g
+        self.executor = ThreadPoolExecutor(workers)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.in_flight = {}
+        self.batches = {}
+        self.counters = {
+            "requests": 0,
+            "coalesced": 0,
+            "searches": 0,
+            "batched": 0,
+            "errors": 0,
+        }
+        self._tasks = set()  # Running batches, kept so they are not garbage collected
+
+    async def query(self, source: int, target: int, algorithm="dijkstra", options=None):
+        """
+        This function answers one query, sharing the work with identical running queries
+        and batching dijkstra queries from the same source.
+
+        Args:
+            source (int): Source node
+            target (int): Target node
+            algorithm (str): Search to run, one of ALGORITHMS
+            options (dict): Options of the search, e.g. {"heuristic": "manhattan"}
+
+        Returns:
+            metrics (dict): metrics of the search, without the predecessor mapping
+        """
+        options = {} if options is None else options
+        if algorithm not in ALGORITHMS:  # Check the request
+            raise ValueError(
+                f"Unknown algorithm {algorithm!r}, expected one of {ALGORITHMS}"
+            )
+        if not isinstance(options, dict):
+            raise TypeError(f"options must be a JSON object, got {options!r}")
+        search = getattr(self.g, algorithm)
+        inspect.signature(search).bind(source, target, **options)  # Unknown options
+        for node in (source, target):
+            if node not in self.g.graph:
+                raise KeyError(f"Node {node!r} is not in the graph")
+
+        self.counters["requests"] += 1
+        key = (algorithm, source, target, tuple(sorted(options.items())))
+        running = self.in_flight.get(key)  # Identical request that is still running
+        if running is not None:  # Wait for its result
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(running)
+
+        loop = asyncio.get_running_loop()
+        future = self.in_flight[key] = loop.create_future()
+        try:
+            if algorithm == "dijkstra" and not options:  # Batched with the same source
+                metrics = await self._batched(source, target)
+            else:  # Run alone in the thread pool
+                metrics = await loop.run_in_executor(
+                    self.executor, partial(search, source, target, **options)
+                )
+                self.counters["searches"] += 1
+                metrics.pop("predecessor", None)  # Too large to send
+                if "stats" in metrics:  # SearchStats of a graph with statistics enabled
+                    metrics["stats"] = metrics["stats"].as_dict()
+            future.set_result(metrics)
+            return metrics
+        except Exception as error:  # Share the error with the coalesced requests
+            future.set_exception(error)
+            future.exception()  # Mark the exception as retrieved
+            raise
+        finally:
+            del self.in_flight[key]
+
+    async def _batched(self, source: int, target: int):
+        """
+        This function adds a dijkstra query to the batch of its source and waits for it.
+
+        Args:
+            source (int): Source node
+            target (int): Target node
+
+        Returns:
+            metrics (dict): metrics of the query
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self.batches.get(source)
+        if batch is None:  # First request from the source, start the timer
+            batch = self.batches[source] = []
+            loop.call_later(self.batch_window, self._flush, source, batch)
+        batch.append((target, future))
+        if len(batch) >= self.max_batch:  # Do not wait for the timer
+            self._flush(source, batch)
+        return await future
+
+    def _flush(self, source: int, batch):
+        """
+        This function starts the search of a batch, if it was not started yet.
+
+        Args:
+            source (int): Source node
+            batch (list): (target, future) pairs of the batch
+
+        Returns:
+            None
+        """
+        if self.batches.get(source) is not batch:  # Started already
+            return
+        del self.batches[source]
+        task = asyncio.ensure_future(self._run_batch(source, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, source: int, batch):
+        """
+        This function answers a batch with one dijkstra search in the thread pool.
+
+        Args:
+            source (int): Source node
+            batch (list): (target, future) pairs of the batch
+
+        Returns:
+            None
+        """
+        targets = {target for target, _ in batch}  # Distinct targets
+        loop = asyncio.get_running_loop()
+        try:
+            settled, parents, repetition = await loop.run_in_executor(
+                self.executor, self.g._search_targets, source, targets
+            )
+        except Exception as error:  # Every request of the batch fails
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        self.counters["searches"] += 1
+        self.counters["batched"] += len(batch)
+        for target, future in batch:
+            future.set_result(
+                _batch_metrics(source, target, settled, parents, repetition)
+            )
+
+    async def handle(self, line: bytes) -> dict:
+        """
+        This function answers one request line.
+
+        Args:
+            line (bytes): JSON request
+
+        Returns:
+            response (dict): JSON response
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object")
+            request_id = request.get("id")
+            if request.get("op") == "stats":  # Counters of the server
+                return {"id": request_id, "stats": dict(self.counters)}
+            metrics = await self.query(
+                request["source"],
+                request["target"],
+                request.get("algorithm", "dijkstra"),
+                request.get("options"),
+            )
+            return {"id": request_id, **metrics}
+        except Exception as error:  # Bad request or failed search, always answered
+            self.counters["errors"] += 1
+            return {"id": request_id, "error": f"{type(error).__name__}: {error}"}
+
+    async def _serve_client(self, reader, writer):
+        """
+        This function reads the requests of a connection and answers each of them in its
+        own task, so a slow query does not hold back the next ones.
+
+        Args:
+            reader (StreamReader): Reader of the connection
+            writer (StreamWriter): Writer of the connection
+
+        Returns:
+            None
+        """
+        lock = asyncio.Lock()  # One response is written at a time
+
+        async def respond(line):
+            response = await self.handle(line)
+            try:
+                data = json.dumps(response)
+            except Exception as error:  # A response that cannot be sent, still answered
+                self.counters["errors"] += 1
+                message = f"{type(error).__name__}: {error}"
+                data = json.dumps({"id": response.get("id"), "error": message})
+            async with lock:
+                writer.write(data.encode() + b"\n")
+                await writer.drain()
+
+        tasks = set()  # Requests of the connection that are not answered yet
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:  # The client closed the connection
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(respond(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)  # Answer the last requests
+        except ConnectionError:  # The client went away
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, path=None):
+        """
+        This function starts listening on a TCP port, or on a Unix socket if a path is given.
+
+        Args:
+            host (str): Host of the TCP socket
+            port (int): Port of the TCP socket
+            path (str): Path of the Unix socket
+
+        Returns:
+            server (asyncio.Server): The listening server
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self._serve_client, path)
+        return await asyncio.start_server(self._serve_client, host, port)
+
+    def close(self):
+        """
+        This function stops the thread pool.
+
+        Returns:
+            None
+        """
+        self.executor.shutdown(wait=True)
+
+
+async def serve(server: QueryServer, host: str, port: int, path=None):
+    """
+    This function runs the server until it is cancelled.
+
+    Args:
+        server (QueryServer): The server
+        host (str): Host of the TCP socket
+        port (int): Port of the TCP socket
+        path (str): Path of the Unix socket
+
+    Returns:
+        None
+    """
+    listener = await server.start(host, port, path)
+    print(f"Listening on {path or f'{host}:{port}'}")
+    async with listener:
+        await listener.serve_forever()
+
+
+""" python server.py --family grid --nodes 100000 --port 8765 """
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shortest path query server")
+    parser.add_argument("--family", choices=sorted(FAMILIES), default="banded")
+    parser.add_argument("--nodes", type=int, default=1000, help="number of nodes")
+    parser.add_argument("--frozen", action="store_true", help="serve a CSRGraph")
+    parser.add_argument("--host", default="127.0.0.1", help="host of the TCP socket")
+    parser.add_argument("--port", type=int, default=8765, help="port of the TCP socket")
+    parser.add_argument("--unix", default=None, help="path of a Unix socket")
+    parser.add_argument("--workers", type=int, default=None, help="search threads")
+    parser.add_argument(
+        "--batch-window", type=float, default=0.002, help="seconds to batch requests"
+    )
+    args = parser.parse_args()  # Parse the arguments
+
+    print(f"Graph is creating with {args.nodes} nodes...", end="")
+    g = build_graph(args.family, args.nodes, frozen=args.frozen)  # Built once
+    print("ok")
+    server = QueryServer(g, args.workers, args.batch_window)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
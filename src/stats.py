@@ -0,0 +1,174 @@
+"""
+@description: This file contains the SearchStats, CountingMinHeap and StatsCollector classes. They measure the work done by the searches.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import threading
+
+# Import modules
+from min_heap import MinHeap
+
+## NOTE: Cost of the measurements ##
+# The heap counters are incremented by CountingMinHeap, which the searches use instead
+# of MinHeap only while statistics are enabled on the graph. The edge relaxations are
+# counted by the search loops in a local variable, one per edge whose neighbor is not
+# settled yet, which costs an integer addition per edge whether statistics are enabled
+# or not. The heaps are indexed, so a node whose key decreases is moved instead of being
+# pushed again, there are no stale entries and every pop settles a node.
+
+FIELDS = (
+    "pushes",
+    "pops",
+    "relaxations",
+    "decreases",
+    "settled",
+    "peak_frontier",
+    "wall_time",
+)  # Counters of a search
+
+
+class SearchStats:
+    """
+    This class holds the counters of one search.
+
+    @attributes:
+        pushes (int): Number of elements pushed to the heaps.
+        pops (int): Number of elements popped from the heaps.
+        relaxations (int): Number of edges the search tried to relax.
+        decreases (int): Number of successful decrease-key operations.
+        settled (int): Number of nodes whose distance became final.
+        peak_frontier (int): Largest number of elements in the heaps at the same time.
+        wall_time (float): Duration of the search in seconds.
+        frontier (int): Current number of elements in the heaps.
+    """
+
+    __slots__ = FIELDS + ("frontier",)
+
+    def __init__(self):
+        for field in self.__slots__:
+            setattr(self, field, 0)
+
+    def as_dict(self) -> dict:
+        """
+        This function returns the counters as a dictionary.
+
+        Returns:
+            stats (dict): Counters by name
+        """
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __repr__(self):
+        counters = ", ".join(f"{field}={getattr(self, field)!r}" for field in FIELDS)
+        return f"SearchStats({counters})"
+
+
+class CountingMinHeap(MinHeap):
+    """
+    This class is a MinHeap that counts its operations in a SearchStats object. Several
+    heaps of one search, like the two heaps of a bidirectional search, can share the same
+    object, so the frontier is the total size of the heaps.
+
+    @attributes:
+        stats (SearchStats): Counters of the search.
+    """
+
+    def __init__(self, stats: SearchStats):
+        super().__init__()  # Inherit MinHeap class
+        self.stats = stats
+
+    def push(self, val):
+        super().push(val)
+        stats = self.stats
+        stats.pushes += 1
+        stats.frontier += 1
+        if stats.frontier > stats.peak_frontier:  # New peak of the frontier
+            stats.peak_frontier = stats.frontier
+
+    def pop(self):
+        val = super().pop()
+        self.stats.pops += 1
+        self.stats.frontier -= 1
+        return val
+
+    def decrease_key(self, node, new_distance):
+        if node in self.position:  # Only a node in the heap can be decreased
+            self.stats.decreases += 1
+        super().decrease_key(node, new_distance)
+
+
+class StatsCollector:
+    """
+    This class adds up the counters of many searches. It can be shared by several graphs
+    and threads.
+
+    @attributes:
+        queries (int): Number of searches collected.
+        cache_hits (int): Number of queries answered by the query cache, which did no
+            search and add nothing to the totals.
+        totals (dict): Sum of every counter, except peak_frontier.
+        peak_frontier (int): Largest frontier of all searches.
+        lock (Lock): Lock of the totals.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        This function sets all the totals to zero.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.queries = 0
+            self.cache_hits = 0
+            self.totals = {field: 0 for field in FIELDS if field != "peak_frontier"}
+            self.peak_frontier = 0
+
+    def add(self, stats: SearchStats):
+        """
+        This function adds the counters of one search.
+
+        Args:
+            stats (SearchStats): Counters of the search
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.queries += 1
+            for field in self.totals:
+                self.totals[field] += getattr(stats, field)
+            self.peak_frontier = max(self.peak_frontier, stats.peak_frontier)
+
+    def add_hit(self):
+        """
+        This function counts a query answered by the query cache.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.cache_hits += 1
+
+    def summary(self) -> dict:
+        """
+        This function returns the totals and the averages per search.
+
+        Returns:
+            summary (dict): queries, cache hits, the totals, the largest frontier and the
+                means
+        """
+        with self.lock:
+            summary = {"queries": self.queries, "cache_hits": self.cache_hits}
+            summary.update(self.totals)
+            summary["peak_frontier"] = self.peak_frontier
+            for field, total in self.totals.items():
+                summary[f"mean_{field}"] = total / self.queries if self.queries else 0
+            return summary
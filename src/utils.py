@@ -10,10 +10,15 @@
 import time
 import matplotlib.pyplot as plt
 
+# Import modules
+from generators import banded_arrays, load_arrays
+
 
 def initialize_graph(g, N):
     """
     This function initializes the graph with the given number of nodes.
+    Every node is connected to the nodes whose ids differ by at most 3, with an edge
+    of weight i + j. The edges are generated with NumPy and added in one batch.
 
     Args:
         g (Graph): Graph object
@@ -21,16 +26,7 @@ def initialize_graph(g, N):
 
     Return (Graph): Initialized graph
     """
-    for i in range(1, N + 1):  # Iterate over the nodes
-        x = (i - 1) % 2  # Get the x coordinate
-        y = (i - 1) // 2  # Get the y coordinate
-        g.add_node(i, y, x)  # Add the node to the graph
-
-    for i in range(1, N + 1):  # Iterate over the nodes
-        for j in range(i, N + 1):  # Iterate over the nodes
-            if abs(i - j) <= 3 and i != j:  # Check if the nodes are neighbors
-                g.add_edge(i, j, i + j)  # Add the edge to the graph
-    return g  # Return the initialized graph
+    return load_arrays(g, banded_arrays(N, 3))  # Return the initialized graph
 
 
 def visualize_graph(g, nodes, edges):
@@ -92,9 +88,13 @@ def visualize_graph(g, nodes, edges):
     plt.show()  # Show the plot
 
 
-def visualize_shortest_path(g, nodes, edges, source, target, algorithm):
+def visualize_shortest_path(
+    g, nodes, edges, source, target, algorithm, metrics=None, explored=None
+):
     """
     This function visualizes the shortest path. It uses matplotlib library.
+    The search is run only if its metrics are not given. The explored nodes, e.g. the
+    settled nodes of a SearchRecorder, are drawn in blue with their order of exploration.
 
     Args:
         g (Graph): Graph object
@@ -103,19 +103,18 @@ def visualize_shortest_path(g, nodes, edges, source, target, algorithm):
         source (int): Source node
         target (int): Target node
         algorithm (str): Algorithm name
+        metrics (dict): Metrics of a search that has already been run
+        explored (list): Nodes in the order the search settled them
 
     Returns:
         None
     """
-    metrics = (
-        g.dijkstra(source, target, viz=True)
-        if algorithm == "dijkstra"
-        else g.a_star(source, target, viz=True)
-    )  # Get the metrics from the algorithm
-
-    parents = (
-        g.dijkstra_parents if algorithm == "dijkstra" else g.a_star_parents
-    )  # Get the parents from the algorithm
+    if metrics is None:  # Run the search
+        metrics = (
+            g.dijkstra(source, target, viz=True)
+            if algorithm == "dijkstra"
+            else g.a_star(source, target, viz=True)
+        )  # Get the metrics from the algorithm
 
     plt.figure(figsize=(8, 4))  # Set the figure size
     plt.axis("off")  # Turn off the axis
@@ -126,14 +125,12 @@ def visualize_shortest_path(g, nodes, edges, source, target, algorithm):
             x, y, str(node), ha="center", va="center", fontsize=20, c="black"
         )  # Plot the node labels
 
-    path = []  # Initialize the path
-    current = target  # Set the current node to the target node
-    while current is not None:  # Iterate until the current node is None
-        path.append(current)  # Append the current node to the path
-        current = parents[
-            current
-        ]  # Set the current node to the parent of the current node
-    path = path[::-1]  # Reverse the path
+    for order, node in enumerate(explored or []):  # Iterate over the explored nodes
+        x, y = g.get_node_coordinates(node)  # Get the coordinates
+        plt.scatter(x, y, s=900, c="lightblue", zorder=0)  # Mark the node
+        plt.text(x, y - 0.3, str(order), ha="center", fontsize=8, c="blue")
+
+    path = metrics["path"]  # Get the path from the algorithm
 
     start_node_position = []  # Initialize the start node position
     end_node_position = []  # Initialize the end node position
@@ -206,10 +203,11 @@ def visualize_shortest_path(g, nodes, edges, source, target, algorithm):
 def compare_algorithms(g1, g2, source, target):
     """
     This function compares the time complexity of dijkstra's algorithm and A* algorithm.
+    The searches do not share any state, so g1 and g2 may be the same graph.
 
     Args:
-        g1 (Graph): Graph object
-        g2 (Graph): Graph object
+        g1 (Graph): Graph object used by dijkstra's algorithm
+        g2 (Graph): Graph object used by A* algorithm
         source (int): Source node
         target (int): Target node
 
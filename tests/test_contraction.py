@@ -0,0 +1,46 @@
+"""
+@description: This file contains the tests of the ContractionHierarchy class.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import random
+import time
+
+# Import modules
+from contraction import ContractionHierarchy
+from generators import build_graph
+
+
+def test_build_is_bounded_on_random_graph():
+    """
+    Random graphs have no hierarchy, so the contraction must stop at a core instead of
+    contracting nodes whose degree keeps growing. The build used to take minutes here.
+    """
+    g = build_graph("random", 2000)
+    start = time.perf_counter()
+    ch = ContractionHierarchy.build(g, max_degree=8)
+    assert time.perf_counter() - start < 30  # A few seconds, with a wide margin
+
+    for node, rank in ch.rank.items():  # Every contracted node had few neighbors
+        if rank != ch.top:
+            assert len(ch.upward[node]) <= 8
+
+
+def test_queries_match_dijkstra():
+    """The queries must return the distances of dijkstra, with paths of real edges."""
+    rng = random.Random(0)
+    for family, N in (("random", 500), ("grid", 900), ("banded", 300)):
+        g = build_graph(family, N)
+        ch = ContractionHierarchy.build(g)
+        for _ in range(50):
+            source, target = rng.randint(1, N), rng.randint(1, N)
+            metrics = ch.query(source, target)
+            assert metrics["distance"] == g.dijkstra(source, target)["distance"]
+            path = metrics["path"]
+            assert path[0] == source and path[-1] == target
+            length = sum(g.get_edge_weight(u, v) for u, v in zip(path, path[1:]))
+            assert length == metrics["distance"]
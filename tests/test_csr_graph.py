@@ -0,0 +1,32 @@
+"""
+@description: This file contains the tests of the CSRGraph class.
+@authors: Mustafa Mert Tunali, Ahmet Yildiz, Kerem Kaya
+@instructor: Prof. Dr. Muhittin Gokmen
+@course: COMP 303 - Algorithm Analysis
+@date: 04-01-2023
+"""
+
+# Import libraries
+import pytest
+
+# Import modules
+from generators import build_graph
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda csr: csr.add_node(100, 0, 0),
+        lambda csr: csr.add_nodes_from([100, 101], [0, 1], [0, 1]),
+        lambda csr: csr.add_edge(1, 2, 5),
+        lambda csr: csr.add_edges_from([1, 2], [3, 4], [5, 6]),
+        lambda csr: csr.update_edge_weight(1, 2, 5),
+        lambda csr: csr.remove_edge(1, 2),
+    ],
+)
+def test_frozen_graph_cannot_be_changed(change):
+    """Every method that changes a Graph raises the same TypeError on a CSRGraph."""
+    csr = build_graph("banded", 20, frozen=True)
+    with pytest.raises(TypeError, match="CSRGraph is frozen"):
+        change(csr)
+    assert len(csr.graph) == 20  # The graph is unchanged